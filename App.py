@@ -8,16 +8,38 @@ try:
 except Exception:
     pass
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, has_request_context, stream_with_context
 from flask_cors import CORS
-import json
 import os
+import hashlib
+import time
+from datetime import date
+
+import data_snapshot
+import metrics
+from boom_index import vind_node, kinderen_van
+from bereikbaarheid import bits_naar_posities, zoek_antwoorden, doorsnede
+from systeem_paden import zoek_systeem_paden, trie_als_boom, trie_als_paden
+from zoekindex import zoek, NODE_TYPES
+import prijs_export
+from staffels import zoek_staffel
+from prijscurve import m2_reeks, bereken_prijscurve
+from planning_index import zoek_planning_systeem, zoek_regel
+from verpakking import optimaliseer_verpakkingen
+import serialisatie
+import schema
+from dagplanner import plan_dagen, DOELEN
+from capaciteit import plan_capaciteit, parse_datum, STANDAARD_HORIZON, STANDAARD_WERKDAGEN
 
 app = Flask(__name__)
+
+# 🔥 snellere JSON (orjson indien geïnstalleerd) voor alle jsonify-responses
+app.json = serialisatie.SnelleJSONProvider(app)
 CORS(
     app,
     resources={r"/api/*": {"origins": "*"}},
-    supports_credentials=True
+    supports_credentials=True,
+    expose_headers=["ETag"]
 )
 
 # =========================
@@ -25,34 +47,65 @@ CORS(
 # =========================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# seconden tussen controles op gewijzigde JSON-bestanden (0 = geen hot reload)
+DATA_RELOAD_INTERVAL = float(os.environ.get("DATA_RELOAD_INTERVAL", 5))
+
 try:
-    with open(os.path.join(BASE_DIR, "keuzeboom.json"), encoding="utf-8") as f:
-        KEUZEBOOM = json.load(f)
+    snapshot = data_snapshot.laad(BASE_DIR)
+    print(f"✅ JSON bestanden succesvol geladen (incl. planning, bron: {snapshot['bron']})")
 
-    with open(os.path.join(BASE_DIR, "Prijstabellen coatingsystemen.json"), encoding="utf-8") as f:
-        PRIJS_DATA = json.load(f)
+except Exception as e:
+    print("❌ FOUT bij laden JSON:", e)
+    raise
 
-    with open(os.path.join(BASE_DIR, "Prijstabellen polijsten.json"), encoding="utf-8") as f:
-        POLIJST_DATA = json.load(f)
+if DATA_RELOAD_INTERVAL > 0:
+    data_snapshot.start_watcher(BASE_DIR, DATA_RELOAD_INTERVAL)
 
-    # 🔥 NIEUW: planning JSON
-    with open(os.path.join(BASE_DIR, "tabellen_planning.json"), encoding="utf-8") as f:
-        PLANNING_DATA = json.load(f)
 
-    print("✅ JSON bestanden succesvol geladen (incl. planning)")
+def huidige_snapshot():
+    """
+    Snapshot voor dit request: bij het eerste gebruik vastgezet in flask.g,
+    zodat een request dat tijdens een reload loopt consistent de oude data houdt.
+    """
+    if not has_request_context():
+        return data_snapshot.actueel()
+
+    snapshot = g.get("snapshot")
+    if snapshot is None:
+        snapshot = g.snapshot = data_snapshot.actueel()
+
+    return snapshot
+
+# =========================
+# METRICS (PER /api-ROUTE)
+# =========================
+@app.before_request
+def metrics_start():
+    g.metrics_start = time.perf_counter()
+
+
+@app.after_request
+def metrics_registreren(response):
+    if request.path.startswith("/api/"):
+        rule = request.url_rule.rule if request.url_rule else "onbekend"
+
+        metrics.registreer_request(
+            route=rule,
+            methode=request.method,
+            status=response.status_code,
+            duur_s=time.perf_counter() - g.get("metrics_start", time.perf_counter()),
+            request_bytes=request.content_length,
+            response_bytes=response.calculate_content_length()
+        )
+
+    return response
 
-except Exception as e:
-    print("❌ FOUT bij laden JSON:", e)
-    raise
 
 # =========================
 # HULPFUNCTIE: NODE OPHALEN
 # =========================
 def get_node(node_id):
-    for node in KEUZEBOOM:
-        if node.get("id") == node_id:
-            return node
-    return None
+    return vind_node(huidige_snapshot()["boom"], node_id)
 
 # =========================
 # PLANNING HELPERS
@@ -60,67 +113,76 @@ def get_node(node_id):
 
 import math
 
-def resolve_systeem_naam(systemen, naam):
-    naam_lower = naam.lower()
+def get_planning_systeem(planning, naam):
+    # 🔥 naam/alias opzoeken; planning_ref is bij het laden al gevolgd
+    systeem = zoek_planning_systeem(planning, naam)
 
-    for systeem in systemen:
-        # directe naam
-        if systeem["naam"].lower() == naam_lower:
-            return systeem["naam"]
+    if not systeem:
+        raise ValueError(f"Systeem niet gevonden: {naam}")
 
-        # 🔥 aliases check
-        if "aliases" in systeem:
-            for alias in systeem["aliases"]:
-                if alias.lower() == naam_lower:
-                    return systeem["naam"]
+    return systeem
 
-    return None
 
+def get_regel(bewerking, m2):
+    return zoek_regel(bewerking, m2)
 
-def get_planning_systeem(systemen, naam):
-    # 🔥 eerst naam resolven (incl. aliases)
-    resolved_naam = resolve_systeem_naam(systemen, naam)
 
-    if not resolved_naam:
-        raise ValueError(f"Systeem niet gevonden: {naam}")
+def afronden_halve_uren(uren):
+    return math.ceil(uren * 2) / 2
 
-    systeem = next((s for s in systemen if s["naam"] == resolved_naam), None)
 
-    # 🔥 planning_ref volgen
-    while systeem.get("planning_ref"):
-        ref = systeem["planning_ref"]
+# =========================
+# HULPFUNCTIE: NODE EXPANDEN (BACKEND-LEIDEND)
+# =========================
 
-        # ook hier weer alias-safe
-        resolved_ref = resolve_systeem_naam(systemen, ref)
+# standaard aantal niveaus dat /api/start en /api/next meesturen
+DEFAULT_DEPTH = 2
 
-        if not resolved_ref:
-            raise ValueError(f"planning_ref niet gevonden: {ref}")
 
-        systeem = next((s for s in systemen if s["naam"] == resolved_ref), None)
+def parse_depth(waarde):
+    """
+    depth uit query/body:
+    - niets opgegeven → DEFAULT_DEPTH
+    - "all" → volledige subboom (None)
+    - anders een geheel getal >= 0; vanaf de hoogte van de boom is dat
+      hetzelfde als "all" (None), zodat cache-keys en ETags begrensd blijven
+    """
+    if waarde is None or waarde == "":
+        return DEFAULT_DEPTH
 
-    return systeem
+    if str(waarde).lower() == "all":
+        return None
 
+    depth = int(waarde)
+    if depth < 0:
+        raise ValueError("depth moet >= 0 zijn")
 
-def get_regel(bewerking, m2):
-    gekozen = None
+    if depth >= huidige_snapshot()["bereikbaar"]["hoogte"]:
+        return None
 
-    for regel in bewerking["regels"]:
-        if m2 >= regel["max_m2"]:
-            gekozen = regel
-        else:
-            break
+    return depth
 
-    return gekozen if gekozen else bewerking["regels"][0]
 
+def expand_node(node, depth=None):
+    """
+    depth=None → volledige subboom (oud gedrag)
+    depth=N    → N niveaus kinderen, dieper wordt "lazy" afgekapt
 
-def afronden_halve_uren(uren):
-    return math.ceil(uren * 2) / 2
+    Resultaat is een kopie van het bovenste niveau; de kinderen
+    worden gedeeld met de cache en mogen niet aangepast worden.
+    """
+    return dict(_expand_node(huidige_snapshot(), node, depth))
 
 
-# =========================
-# HULPFUNCTIE: NODE EXPANDEN (BACKEND-LEIDEND)
-# =========================
-def expand_node(node):
+def _expand_node(snapshot, node, depth):
+
+    # cache hoort bij de snapshot → vervalt vanzelf bij een reload
+    cache = snapshot["expand_cache"]
+
+    cache_key = (node.get("id"), depth)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     expanded = {
         "id": node.get("id"),
@@ -149,18 +211,25 @@ def expand_node(node):
     # =========================
     # CHILD NODES EXPANDEN
     # =========================
-    for child in node.get("next", []):
+    kinderen = kinderen_van(snapshot["boom"], node)
 
-        if isinstance(child, dict):
-            expanded["next"].append(child)
-            continue
+    if depth == 0:
+        # kinderen komen later via /api/next
+        if kinderen:
+            expanded["lazy"] = True
 
-        child_node = get_node(child)
-        if not child_node:
-            continue
+    else:
+        child_depth = None if depth is None else depth - 1
+
+        for child, inline in kinderen:
+
+            if inline:
+                expanded["next"].append(child)
+                continue
 
-        expanded["next"].append(expand_node(child_node))
+            expanded["next"].append(_expand_node(snapshot, child, child_depth))
 
+    cache[cache_key] = expanded
     return expanded
 
 
@@ -196,12 +265,19 @@ def resolve_next_node(current_node, choice_index):
 # PLANNING BEREKENING
 # =========================
 
-def bereken_planning(systemen, systeem_naam, m2, reistijd_min, ruimtes=1, meerwerk=None, hellingbaan=False):
+PLANNING_MODI = ("standaard", "optimaal")
+
+
+def bereken_planning(planning, systeem_naam, m2, reistijd_min, ruimtes=1, meerwerk=None, hellingbaan=False,
+                     modus="standaard", doel="dagen", max_man=None):
+
+    if modus not in PLANNING_MODI:
+        raise ValueError(f"Onbekende planningsmodus: {modus}")
 
     if meerwerk is None:
         meerwerk = []
 
-    systeem = get_planning_systeem(systemen, systeem_naam)
+    systeem = get_planning_systeem(planning, systeem_naam)
 
     reistijd_uren = (reistijd_min * 2) / 60
     max_werk_per_persoon = 10 - reistijd_uren
@@ -240,7 +316,8 @@ def bereken_planning(systemen, systeem_naam, m2, reistijd_min, ruimtes=1, meerwe
             "naam": b["naam"],
             "uren": round(uren, 1),
             "type": "standaard",
-            "min_man": regel.get("man", 1)
+            "min_man": regel.get("man", 1),
+            "bewerking": b
         })
 
     # =========================
@@ -262,6 +339,9 @@ def bereken_planning(systemen, systeem_naam, m2, reistijd_min, ruimtes=1, meerwe
             "min_man": 1
         })
 
+    if modus == "optimaal":
+        return planning_optimaal(dagen, max_werk_per_persoon, reistijd_uren, doel, max_man)
+
     # =========================
     # PLANNING OPBOUWEN
     # =========================
@@ -272,6 +352,7 @@ def bereken_planning(systemen, systeem_naam, m2, reistijd_min, ruimtes=1, meerwe
 
         # 🔥 meerwerk eerst tonen
         taken = sorted(taken, key=lambda t: 0 if t.get("type") == "meerwerk" else 1)
+        taken = [{k: v for k, v in t.items() if k != "bewerking"} for t in taken]
 
         totaal_uren = round(sum(t["uren"] for t in taken), 1)
 
@@ -300,6 +381,186 @@ def bereken_planning(systemen, systeem_naam, m2, reistijd_min, ruimtes=1, meerwe
     return planning
 
 
+def planning_optimaal(dagen, max_werk_per_persoon, reistijd_uren, doel="dagen", max_man=None):
+    """
+    Zelfde uitvoer als de standaardplanning, maar de dagindeling en ploeg komen
+    uit de dagplanner (volgorde, droogtijd, onderbreekbaar, mag_(niet_)samen_met).
+    """
+    taken = []
+
+    # tabeldag bepaalt de volgorde; meerwerk van een dag gaat voor de bewerkingen
+    for dag in sorted(dagen.keys()):
+        for t in sorted(dagen[dag], key=lambda t: 0 if t.get("type") == "meerwerk" else 1):
+            b = t.get("bewerking") or {}
+
+            taken.append({
+                "naam": t["naam"],
+                "uren": t["uren"],
+                "type": t["type"],
+                "min_man": t["min_man"],
+                "dag": dag,
+                "onderbreekbaar": b.get("onderbreekbaar", t["type"] == "meerwerk"),
+                "volgende_dag_verplicht": b.get("volgende_dag_verplicht", False),
+                "samen_met": set(b.get("mag_samen_met", [])),
+                "niet_samen_met": set(b.get("mag_niet_samen_met", [])),
+            })
+
+    planning = []
+
+    for nummer, dag in enumerate(plan_dagen(taken, max_werk_per_persoon, doel, max_man), start=1):
+        man = dag["man"]
+        totaal_uren = round(dag["uren"], 1)
+
+        werkzaamheden = []
+        for taak, uren in dag["delen"]:
+            regel = {
+                "naam": taak["naam"],
+                "uren": round(uren, 1),
+                "type": taak["type"],
+                "min_man": taak["min_man"]
+            }
+            if uren < taak["uren"] - 1e-9:
+                regel["deel_van_uren"] = taak["uren"]
+            werkzaamheden.append(regel)
+
+        uren_per_persoon = afronden_halve_uren(totaal_uren / man)
+
+        planning.append({
+            "dag": nummer,
+            "man": man,
+            "uren_per_persoon": afronden_halve_uren(uren_per_persoon + reistijd_uren),
+            "werk_uren_per_persoon": uren_per_persoon,
+            "reistijd_per_persoon": reistijd_uren,
+            "totaal_werk": round(totaal_uren, 2),
+            "totaal_incl_reistijd": round(totaal_uren + (man * reistijd_uren), 2),
+            "werkzaamheden": werkzaamheden
+        })
+
+    return planning
+
+
+
+# =========================
+# PAD DOORLOPEN (HELE KEUZEREEKS)
+# =========================
+
+MAX_PAD_STAPPEN = 200
+
+
+def als_lijst(waarde):
+    """forced_extras staat in de boom soms als losse string."""
+    if not waarde:
+        return []
+    if isinstance(waarde, list):
+        return list(waarde)
+    return [waarde]
+
+
+def loop_pad(start_id, keuzes):
+    """
+    Loopt een reeks keuze-indexen af vanaf start_id met dezelfde regels als
+    /api/next. Stopt bij de eerste ongeldige keuze.
+    Geeft (resultaat, None) of (None, (foutpayload, statuscode)) terug.
+    """
+    node = get_node(start_id)
+    if not node:
+        return None, ({"error": "node niet gevonden", "node_id": start_id}, 404)
+
+    pad = []
+    gezet = {}
+    chosen_extra = []
+    forced_extras = []
+    systeem = None
+
+    def bezoek(n):
+        nonlocal systeem
+
+        if n.get("set"):
+            gezet.update(n["set"])
+
+        extra = n.get("chosen_extra")
+        if extra and extra not in chosen_extra:
+            chosen_extra.append(extra)
+
+        if n.get("type") == "systeem":
+            systeem = n.get("text")
+            for fx in als_lijst(n.get("forced_extras")):
+                if fx not in forced_extras:
+                    forced_extras.append(fx)
+
+        pad.append({"id": n.get("id"), "type": n.get("type"), "text": n.get("text", "")})
+
+    bezoek(node)
+
+    for stap, keuze in enumerate(keuzes):
+        volgende = None
+        if isinstance(keuze, int) and not isinstance(keuze, bool) and keuze >= 0:
+            volgende = resolve_next_node(node, keuze)
+
+        if not volgende:
+            return None, ({
+                "error": "ongeldige keuze",
+                "stap": stap,
+                "node_id": node.get("id"),
+                "choice": keuze,
+                "pad": pad
+            }, 400)
+
+        pad[-1]["choice"] = keuze
+        node = volgende
+        bezoek(node)
+
+    return {
+        "node": node,
+        "pad": pad,
+        "set": gezet,
+        "chosen_extra": chosen_extra,
+        "forced_extras": forced_extras,
+        "systeem": systeem
+    }, None
+
+
+# =========================
+# HTTP CACHING (ETAG)
+# =========================
+
+# boomresponses hangen alleen af van de dataversie + node → mogen gecachet worden
+TREE_CACHE_CONTROL = "public, max-age=60"
+
+
+def boom_etag(*delen):
+    """Sterke ETag uit de snapshot-hash plus node-id/depth."""
+    sleutel = "|".join([huidige_snapshot()["versie"]] + [str(d) for d in delen])
+    return hashlib.sha256(sleutel.encode("utf-8")).hexdigest()[:32]
+
+
+def niet_gewijzigd(etag):
+    """304-response als de client deze versie al heeft, anders None."""
+    if etag not in request.if_none_match:
+        return None
+
+    response = app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = TREE_CACHE_CONTROL
+    return response
+
+
+def cacheable_json(maak_payload, etag):
+    """
+    Response voor een boompayload; de JSON-bytes worden per ETag in de
+    snapshot bewaard, dus dezelfde node wordt maar één keer geserialiseerd.
+    """
+    cache = huidige_snapshot()["json_cache"]
+
+    body = cache.get(etag)
+    if body is None:
+        body = cache[etag] = serialisatie.dumps(maak_payload()) + b"\n"
+
+    response = serialisatie.bytes_response(app, body)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = TREE_CACHE_CONTROL
+    return response
+
 
 # =========================
 # API: START
@@ -307,15 +568,28 @@ def bereken_planning(systemen, systeem_naam, m2, reistijd_min, ruimtes=1, meerwe
 @app.route("/api/start", methods=["GET"])
 def start():
     try:
+        try:
+            depth = parse_depth(request.args.get("depth"))
+        except ValueError:
+            return jsonify({"error": "ongeldige depth"}), 400
+
+        etag = boom_etag("start", "BFC", depth)
+        cached = niet_gewijzigd(etag)
+        if cached is not None:
+            return cached
+
         start_node = get_node("BFC")
         if not start_node:
             return jsonify({"error": "start-node niet gevonden"}), 500
 
-        response = expand_node(start_node)
-        response["ui_mode"] = "keuzegids"
-        response["paused"] = False
+        def payload():
+            response = expand_node(start_node, depth)
+            response["ui_mode"] = "keuzegids"
+            response["paused"] = False
+            response["bereikbaar"] = bereikbaar_info("BFC")
+            return response
 
-        return jsonify(response), 200
+        return cacheable_json(payload, etag), 200
 
     except Exception as e:
         print("❌ API /start error:", e)
@@ -328,15 +602,44 @@ def start():
 # =========================
 # API: NEXT
 # =========================
-@app.route("/api/next", methods=["POST"])
+# depth in een body: getal of "all" (parse_depth doet de rest)
+DEPTH_VELD = schema.een_van(schema.geheel(verplicht=True), schema.tekst(verplicht=True, max_lengte=10), verplicht=False)
+
+NEXT_SCHEMA = schema.compileer({
+    "node_id": schema.een_van(schema.tekst(verplicht=True, max_lengte=50), schema.geheel(verplicht=True)),
+    "choice": schema.geheel(verplicht=True, min=0),
+    "depth": DEPTH_VELD,
+})
+
+
+@app.route("/api/next", methods=["GET", "POST"])
 def next_node():
-    data = request.json
+    # GET-variant (cachebaar): /api/next?node_id=...&choice=...&depth=...
+    if request.method == "GET":
+        data = request.args
+    else:
+        try:
+            data = NEXT_SCHEMA(request.get_json(silent=True))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
     node_id = data.get("node_id")
     choice_index = data.get("choice")
 
     if node_id is None or choice_index is None:
         return jsonify({"error": "node_id en choice verplicht"}), 400
 
+    try:
+        depth = parse_depth(request.args.get("depth", data.get("depth")))
+        if request.method == "GET":
+            choice_index = int(choice_index)
+    except (ValueError, TypeError):
+        return jsonify({"error": "ongeldige depth of choice"}), 400
+
+    # ❌ geen negatieve index (zou via Python-indexering het laatste kind geven)
+    if choice_index < 0:
+        return jsonify({"error": "choice: minimaal 0"}), 400
+
     current_node = get_node(node_id)
     if not current_node:
         return jsonify({"error": "node niet gevonden"}), 404
@@ -347,89 +650,372 @@ def next_node():
     if not next_node_obj:
         return jsonify({"error": "volgende node niet gevonden"}), 404
 
-    return jsonify(expand_node(next_node_obj)), 200
+    if request.method == "GET":
+        etag = boom_etag("node", next_node_obj.get("id"), depth)
+        cached = niet_gewijzigd(etag)
+        if cached is not None:
+            return cached
+
+        return cacheable_json(lambda: next_payload(next_node_obj, depth), etag), 200
+
+    return jsonify(next_payload(next_node_obj, depth)), 200
+
+
+def next_payload(node, depth):
+    response = expand_node(node, depth)
+    response["bereikbaar"] = bereikbaar_info(node.get("id"))
+    return response
+
+# =========================
+# API: PATH (HELE KEUZEREEKS IN ÉÉN REQUEST)
+# =========================
+PAD_SCHEMA = schema.compileer({
+    "node_id": schema.tekst(standaard="BFC", max_lengte=50),
+    "choices": schema.lijst(schema.geheel(verplicht=True, min=0), MAX_PAD_STAPPEN),
+    "depth": DEPTH_VELD,
+})
+
+
+@app.route("/api/path", methods=["POST"])
+def path_endpoint():
+    ruw = request.get_json(silent=True)
+
+    try:
+        data = PAD_SCHEMA(ruw)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # lege lijst mag (dan alleen de start-node), weglaten niet
+    if not isinstance(ruw, dict) or not isinstance(ruw.get("choices"), list):
+        return jsonify({"error": "choices (lijst met keuze-indexen) verplicht"}), 400
+
+    try:
+        depth = parse_depth(request.args.get("depth", data["depth"]))
+    except (ValueError, TypeError):
+        return jsonify({"error": "ongeldige depth"}), 400
+
+    resultaat, fout = loop_pad(data["node_id"], data["choices"])
+    if fout:
+        return jsonify(fout[0]), fout[1]
+
+    resultaat["node"] = expand_node(resultaat["node"], depth)
+    return jsonify(resultaat), 200
+
+
+# =========================
+# BEREIKBAARHEID (NOG MOGELIJKE SYSTEMEN)
+# =========================
+MAX_BEPERKINGEN = 25
+
+
+def bereikbaar_samenvatting(systeem_bits, afw_bits):
+    """Bitsets → ids/namen voor de response."""
+    index = huidige_snapshot()["bereikbaar"]
+    nodes = huidige_snapshot()["boom"]["nodes"]
+
+    systeem_ids = [index["systemen"][i] for i in bits_naar_posities(systeem_bits)]
+
+    return {
+        "systemen": sorted({nodes[node_id].get("text", "") for node_id in systeem_ids}),
+        "systeem_ids": systeem_ids,
+        "afw_ids": [index["afwijkingen"][i] for i in bits_naar_posities(afw_bits)],
+    }
+
+
+def bereikbaar_info(node_id):
+    """Wat er vanaf deze node nog kan: systemen, afwijkingen en aantal vragen."""
+    index = huidige_snapshot()["bereikbaar"]
+    node_id = str(node_id)
+
+    info = bereikbaar_samenvatting(index["systeem_bits"][node_id], index["afw_bits"][node_id])
+    info["vragen_min"] = index["vragen_min"][node_id]
+    info["vragen_max"] = index["vragen_max"][node_id]
+    return info
+
+
+BEPERKING_SCHEMA = schema.object_({
+    "vraag": schema.tekst(),
+    "antwoord": schema.tekst(),
+    "antwoord_id": schema.tekst(max_lengte=20),
+})
+
+BEREIKBAAR_SCHEMA = schema.compileer({
+    "node_id": schema.tekst(standaard="BFC", max_lengte=20),
+    "constraints": schema.lijst(BEPERKING_SCHEMA, MAX_BEPERKINGEN),
+})
+
+
+@app.route("/api/bereikbaar", methods=["POST"])
+def bereikbaar_endpoint():
+    """
+    Doorsnede van beperkingen, bv.
+    {"constraints": [{"vraag": "geïsoleerd", "antwoord": "ja"},
+                     {"vraag": "belasting", "antwoord": "Zwaar"}]}
+    → systemen die vanaf node_id nog bereikbaar zijn via een pad dat aan
+    alle beperkingen voldoet.
+    """
+    try:
+        data = BEREIKBAAR_SCHEMA(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    node_id = data["node_id"]
+    if not get_node(node_id):
+        return jsonify({"error": "node niet gevonden", "node_id": node_id}), 404
+
+    index = huidige_snapshot()["bereikbaar"]
+    beperkingen = []
+
+    for i, beperking in enumerate(data["constraints"]):
+        if beperking["antwoord_id"] is None and (beperking["vraag"] is None or beperking["antwoord"] is None):
+            return jsonify({"error": f"constraints[{i}]: antwoord_id of vraag + antwoord verplicht"}), 400
+
+        antwoord_ids = zoek_antwoorden(index, beperking["vraag"], beperking["antwoord"], beperking["antwoord_id"])
+        if not antwoord_ids:
+            return jsonify({"error": f"constraints[{i}]: geen passend antwoord in de keuzeboom"}), 400
+
+        beperkingen.append(antwoord_ids)
+
+    systeem_bits, afw_bits = doorsnede(index, node_id, beperkingen)
+
+    response = bereikbaar_samenvatting(systeem_bits, afw_bits)
+    response["node_id"] = node_id
+    response["aantal_systemen"] = len(response["systeem_ids"])
+    response["antwoord_ids"] = beperkingen
+    return jsonify(response), 200
+
+
+# =========================
+# API: SYSTEEM-PADEN (WELKE ANTWOORDEN LEIDEN NAAR SYSTEEM X)
+# =========================
+SYSTEEM_PADEN_VORMEN = ("boom", "paden")
+
+
+@app.route("/api/systeem-paden", methods=["GET"])
+def systeem_paden_endpoint():
+    """
+    /api/systeem-paden                          → alle systeemnamen + aantal paden
+    /api/systeem-paden?systeem=Rolcoating Basic → paden per systeemnaam; namen die
+                                                  via planning-aliases bij hetzelfde
+                                                  systeem horen komen mee
+    vorm=boom (standaard, prefix-trie) of vorm=paden (platte lijst)
+    """
+    naam = (request.args.get("systeem") or "").strip()
+    vorm = request.args.get("vorm", "boom")
+
+    if vorm not in SYSTEEM_PADEN_VORMEN:
+        return jsonify({"error": f"vorm moet een van {list(SYSTEEM_PADEN_VORMEN)} zijn"}), 400
+
+    etag = boom_etag("systeem-paden", naam.lower(), vorm)
+    cached = niet_gewijzigd(etag)
+    if cached is not None:
+        return cached
+
+    snapshot = huidige_snapshot()
+    index = snapshot["systeem_paden"]
+
+    if not naam:
+        return cacheable_json(lambda: {
+            "systemen": [
+                {"naam": item["naam"], "aantal_paden": item["aantal_paden"]}
+                for item in sorted(index["per_naam"].values(), key=lambda item: item["naam"].lower())
+            ]
+        }, etag), 200
+
+    gevonden = zoek_systeem_paden(index, naam)
+    if not gevonden:
+        return jsonify({"error": "systeem niet gevonden", "systeem": naam}), 404
+
+    def payload():
+        resultaten = []
+        for item in gevonden:
+            resultaat = {
+                "naam": item["naam"],
+                "systeem_ids": list(item["systeem_ids"]),
+                "aantal_paden": item["aantal_paden"],
+            }
+            if item["trie"] is None:
+                resultaat[vorm] = None if vorm == "boom" else []
+            elif vorm == "boom":
+                resultaat["boom"] = trie_als_boom(snapshot["boom"], item["trie"])
+            else:
+                resultaat["paden"] = trie_als_paden(snapshot["boom"], item["trie"])
+            resultaten.append(resultaat)
+
+        return {"systeem": naam, "systemen": resultaten}
+
+    return cacheable_json(payload, etag), 200
+
+
+# =========================
+# API: ZOEKEN (NODE-TEKSTEN)
+# =========================
+MAX_ZOEK_LENGTE = 200
+MAX_ZOEK_LIMIET = 100
+STANDAARD_ZOEK_LIMIET = 20
+
+
+@app.route("/api/search", methods=["GET"])
+def search_endpoint():
+    """
+    /api/search?q=hellingbaan
+    /api/search?q=anti&type=vraag,antwoord&limit=50
+
+    Elk woord in q matcht als woordbegin; hoofdletters en accenten tellen niet.
+    """
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"error": "q verplicht"}), 400
+    if len(query) > MAX_ZOEK_LENGTE:
+        return jsonify({"error": f"q maximaal {MAX_ZOEK_LENGTE} tekens"}), 400
+
+    types = [t.strip() for t in request.args.get("type", "").split(",") if t.strip()]
+    onbekend = [t for t in types if t not in NODE_TYPES]
+    if onbekend:
+        return jsonify({"error": f"type moet een van {list(NODE_TYPES)} zijn", "type": onbekend}), 400
+
+    try:
+        limiet = int(request.args.get("limit", STANDAARD_ZOEK_LIMIET))
+    except ValueError:
+        return jsonify({"error": "ongeldige limit"}), 400
+    limiet = max(1, min(limiet, MAX_ZOEK_LIMIET))
+
+    snapshot = huidige_snapshot()
+    index = snapshot["zoekindex"]
+    nodes = snapshot["boom"]["nodes"]
+
+    totaal, treffers = zoek(index, query, types, limiet)
+
+    resultaten = []
+    for positie, score in treffers:
+        node_id = index["ids"][positie]
+        node = nodes[node_id]
+        resultaten.append({
+            "id": node_id,
+            "type": node.get("type"),
+            "text": node.get("text", ""),
+            "score": round(score, 4),
+        })
+
+    return jsonify({"q": query, "totaal": totaal, "resultaten": resultaten}), 200
+
+
+# =========================
+# REQUEST-SCHEMA'S
+# =========================
+
+# maxima voor lijsten in een request (vijandige payloads kosten anders veel CPU)
+MAX_EXTRAS = 50
+MAX_FASES = 50
+MAX_MEERWERK = 50
+
+EXTRAS_SCHEMA = schema.lijst(
+    schema.een_van(
+        schema.tekst(verplicht=True, max_lengte=100),
+        schema.object_({
+            "key": schema.tekst(verplicht=True, max_lengte=100),
+            "m2": schema.getal(standaard=0, min=0, max=100000),
+        }, verplicht=True),
+    ),
+    MAX_EXTRAS
+)
+
+MEERWERK_SCHEMA = schema.lijst(
+    schema.object_({
+        "naam": schema.tekst(standaard="meerwerk"),
+        "uren": schema.getal(standaard=0, min=0, max=1000),
+        "dag": schema.geheel(min=1, max=100),
+    }, verplicht=True),
+    MAX_MEERWERK
+)
+
+PRIJS_SCHEMA = schema.compileer({
+    "systeem": schema.tekst(verplicht=True),
+    "oppervlakte": schema.getal(verplicht=True, min=0, max=100000),
+    "ruimtes": schema.geheel(verplicht=True, min=1),
+    "extras": EXTRAS_SCHEMA,
+    "forced_extras": schema.lijst(schema.tekst(verplicht=True, max_lengte=100), MAX_EXTRAS),
+    "heeft_hellingbaan": schema.ja_nee(),
+    "xtr_coating_verwijderen_uren": schema.getal(standaard=0, min=0, max=1000),
+    "meerwerk_uren": schema.getal(standaard=0, min=0, max=1000),
+    "meerwerk_toelichting": schema.tekst(standaard="", max_lengte=1000),
+    "materiaal_bedrag": schema.getal(standaard=0, min=0, max=1000000),
+    "materiaal_toelichting": schema.tekst(standaard="", max_lengte=1000),
+})
+
 
 # =========================
 # API: PRIJSBEREKENING
 # =========================
-@app.route("/api/price", methods=["POST"])
-def calculate_price():
-    data = request.json or {}
+def bereken_coating_prijs(data):
+    """
+    Prijsberekening coating zonder Flask-request:
+    geeft (payload, statuscode) terug. Gebruikt door /api/price en /api/price/batch.
+    """
 
-    oppervlakte = data.get("oppervlakte")
-    ruimtes = data.get("ruimtes")
-    systeem = data.get("systeem")
+    try:
+        data = PRIJS_SCHEMA(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
 
-    gekozen_extras = data.get("extras", []) or []
-    forced_extras = data.get("forced_extras", []) or []
-    heeft_hellingbaan = data.get("heeft_hellingbaan", False)
+    oppervlakte = data["oppervlakte"]
+    ruimtes = str(data["ruimtes"])
+    systeem = data["systeem"]
 
+    # nieuwe lijst: de extras van de client worden niet aangepast
+    gekozen_extras = data["extras"]
+    forced_extras = data["forced_extras"]
+    heeft_hellingbaan = data["heeft_hellingbaan"]
 
     for fx in forced_extras:
         if fx not in gekozen_extras:
             gekozen_extras.append(fx)
 
-    xtr_uren = float(data.get("xtr_coating_verwijderen_uren", 0) or 0)
+    xtr_uren = data["xtr_coating_verwijderen_uren"]
     XTR_TARIEF = 120
 
-    meerwerk_uren = float(data.get("meerwerk_uren", 0) or 0)
-    meerwerk_toelichting = data.get("meerwerk_toelichting", "")
+    meerwerk_uren = data["meerwerk_uren"]
+    meerwerk_toelichting = data["meerwerk_toelichting"]
     MEERWERK_TARIEF = 120
 
-    materiaal_bedrag = float(data.get("materiaal_bedrag", 0) or 0)
-    materiaal_toelichting = data.get("materiaal_toelichting", "")
-
-    if not systeem:
-        return jsonify({"error": "geen systeem opgegeven"}), 400
-
-    if oppervlakte is None or ruimtes is None:
-        return jsonify({"error": "oppervlakte en ruimtes verplicht"}), 400
-
-    try:
-        oppervlakte = float(oppervlakte)
-        ruimtes = str(int(ruimtes))
-    except (ValueError, TypeError):
-        return jsonify({"error": "ongeldige invoer"}), 400
+    materiaal_bedrag = data["materiaal_bedrag"]
+    materiaal_toelichting = data["materiaal_toelichting"]
 
     systeem_key = systeem.replace("Sys:", "").strip()
 
-    prijs_systeem = PRIJS_DATA.get("systemen", {}).get(systeem_key)
+    snapshot = huidige_snapshot()
+    prijs_data = snapshot["prijs_data"]
+
+    prijs_systeem = prijs_data.get("systemen", {}).get(systeem_key)
     if not prijs_systeem:
-        return jsonify({"error": f"prijssysteem '{systeem_key}' niet gevonden"}), 404
+        metrics.tel_domeinfout("prijssysteem_niet_gevonden")
+        return {"error": f"prijssysteem '{systeem_key}' niet gevonden"}, 404
 
-    staffels = prijs_systeem.get("staffel", [])
     prijzen = prijs_systeem.get("prijzen", {}).get(ruimtes)
     omschrijving = prijs_systeem.get("omschrijving", [])
 
     if not prijzen:
-        return jsonify({"error": "geen prijzen voor dit aantal ruimtes"}), 400
+        return {"error": "geen prijzen voor dit aantal ruimtes"}, 400
 
     # =========================
     # MINIMALE OPPERVLAKTE CHECK
     # =========================
     if oppervlakte < 30:
-        return jsonify({
+        metrics.tel_domeinfout("m2_te_klein")
+        return {
             "error": "m2_te_klein",
             "message": "Minimale oppervlakte is 30 m²"
-        }), 200
-
-    prijs_per_m2 = None
-
-    for index, bereik in enumerate(staffels):
-        if bereik.endswith("+"):
-            if oppervlakte >= float(bereik.replace("+", "")):
-                prijs_per_m2 = prijzen[index]
-                break
-        else:
-            min_m2, max_m2 = map(float, bereik.split("-"))
-            if min_m2 <= oppervlakte <= max_m2:
-                prijs_per_m2 = prijzen[index]
-                break
-
-    if prijs_per_m2 is None:
-        return jsonify({
+        }, 200
+
+    index = zoek_staffel(snapshot["prijs_staffels"][systeem_key], oppervlakte)
+
+    if index is None:
+        metrics.tel_domeinfout("geen_passende_staffel")
+        return {
             "error": "geen passende staffel gevonden"
-        }), 200
+        }, 200
+
+    prijs_per_m2 = prijzen[index]
 
     basisprijs = prijs_per_m2 * oppervlakte
 
@@ -443,13 +1029,10 @@ def calculate_price():
 
     basisprijs = round(basisprijs * factor)
 
-    extras_prijslijst = PRIJS_DATA.get("extras", {})
-    extra_systemen = PRIJS_DATA.get("extra_systemen", {})
+    extras_prijslijst = prijs_data.get("extras", {})
+    extra_systemen = prijs_data.get("extra_systemen", {})
 
-    normalized_extra_systemen = {
-        key.strip().lower(): key
-        for key in extra_systemen.keys()
-    }
+    normalized_extra_systemen = snapshot["extra_systemen_sleutels"]
 
     normalized_forced = [fx.strip().lower() for fx in forced_extras]
 
@@ -460,10 +1043,10 @@ def calculate_price():
 
         if isinstance(extra_item, dict):
 
-            extra_key = extra_item.get("key")
-            m2 = float(extra_item.get("m2", 0) or 0)
+            extra_key = extra_item["key"]
+            m2 = extra_item["m2"]
 
-            if not extra_key or m2 <= 0:
+            if m2 <= 0:
                 continue
 
             extra = extras_prijslijst.get(extra_key.strip())
@@ -497,28 +1080,18 @@ def calculate_price():
             echte_key = normalized_extra_systemen[normalized_key]
             addon = extra_systemen.get(echte_key)
 
-            staffels_addon = addon.get("staffel", [])
             prijzen_addon = addon.get("prijzen", {}).get(ruimtes)
 
             if not prijzen_addon:
                 continue
 
-            prijs_per_m2_addon = None
-
-            for index, bereik in enumerate(staffels_addon):
-                if bereik.endswith("+"):
-                    if oppervlakte >= float(bereik.replace("+", "")):
-                        prijs_per_m2_addon = prijzen_addon[index]
-                        break
-                else:
-                    min_m2, max_m2 = map(float, bereik.split("-"))
-                    if min_m2 <= oppervlakte <= max_m2:
-                        prijs_per_m2_addon = prijzen_addon[index]
-                        break
+            index_addon = zoek_staffel(snapshot["extra_staffels"][echte_key], oppervlakte)
 
-            if prijs_per_m2_addon is None:
+            if index_addon is None:
                 continue
 
+            prijs_per_m2_addon = prijzen_addon[index_addon]
+
             totaal_addon = round(prijs_per_m2_addon * oppervlakte)
             extra_totaal += totaal_addon
 
@@ -602,7 +1175,7 @@ def calculate_price():
             "forced": False
         })
 
-    return jsonify({
+    return {
         "systeem": systeem_key,
         "oppervlakte": oppervlakte,
         "ruimtes": int(ruimtes),
@@ -611,72 +1184,159 @@ def calculate_price():
         "omschrijving": omschrijving,
         "extras": extra_details,
         "totaalprijs": totaalprijs
-    })
+    }, 200
+
+
+@app.route("/api/price", methods=["POST"])
+def calculate_price():
+    payload, status = bereken_coating_prijs(request.get_json(silent=True))
+    return jsonify(payload), status
+
+
+# =========================
+# API: PRIJSBEREKENING (BULK)
+# =========================
+
+MAX_BATCH_ITEMS = 5000
+
+
+@app.route("/api/price/batch", methods=["POST"])
+def calculate_price_batch():
+    data = request.get_json(silent=True)
+
+    # zowel een kale lijst als {"items": [...]} accepteren
+    items = data.get("items") if isinstance(data, dict) else data
+
+    if not isinstance(items, list):
+        return jsonify({"error": "lijst met prijsaanvragen verplicht"}), 400
+
+    if len(items) > MAX_BATCH_ITEMS:
+        return jsonify({"error": f"maximaal {MAX_BATCH_ITEMS} prijsaanvragen per batch"}), 400
+
+    resultaten = []
+
+    for item in items:
+        if not isinstance(item, dict):
+            resultaten.append({"status": 400, "resultaat": {"error": "ongeldige prijsaanvraag"}})
+            continue
+
+        try:
+            payload, status = bereken_coating_prijs(item)
+        except Exception as e:
+            print("❌ batch price error:", e)
+            payload, status = {"error": str(e)}, 500
+
+        resultaten.append({"status": status, "resultaat": payload})
+
+    return jsonify({"resultaten": resultaten}), 200
+
+
+# =========================
+# API: PRIJSCURVE (ALLE SYSTEMEN OVER EEN M2-BEREIK)
+# =========================
+@app.route("/api/price/curve", methods=["GET"])
+def price_curve():
+
+    try:
+        m2 = m2_reeks(
+            float(request.args.get("van", 30)),
+            float(request.args.get("tot", 1000)),
+            float(request.args.get("stap", 10))
+        )
+        ruimtes_lijst = [
+            int(r) for r in request.args.get("ruimtes", "1,2,3").split(",") if r.strip()
+        ]
+    except ValueError as e:
+        return jsonify({"error": "ongeldige invoer", "details": str(e)}), 400
+
+    snapshot = huidige_snapshot()
+    systemen = snapshot["prijs_data"].get("systemen", {})
+
+    # 🔑 afw-node: alleen de systemen uit deze afweging vergelijken
+    node_id = request.args.get("node_id")
+    if node_id:
+        node = get_node(node_id)
+        if not node:
+            return jsonify({"error": "node niet gevonden"}), 404
+
+        namen = [
+            snapshot["boom"]["teksten"][child["id"]]
+            for child, inline in kinderen_van(snapshot["boom"], node)
+            if not inline and child.get("type") == "systeem"
+        ]
+        systemen = {naam: systemen[naam] for naam in namen if naam in systemen}
+
+    # dubbele en onbekende ruimtes eruit: elke waarde kost een volledige curve + break-even
+    bekend = {r for tabel in systemen.values() for r in tabel.get("prijzen", {})}
+    ruimtes_lijst = [r for r in dict.fromkeys(ruimtes_lijst) if str(r) in bekend]
+    if bekend and not ruimtes_lijst:
+        return jsonify({"error": "ongeldige invoer", "details": f"ruimtes moet een van {sorted(bekend)} zijn"}), 400
+
+    return jsonify(bereken_prijscurve(systemen, snapshot["prijs_staffels"], m2, ruimtes_lijst)), 200
 
 
 # =========================
 # API: POLIJST PRIJS (GECORRIGEERD)
 # =========================
-@app.route("/api/polijst-price", methods=["POST"])
-def calculate_polijst_price():
+POLIJST_SCHEMA = schema.compileer({
+    "systeem": schema.tekst(verplicht=True),
+    "klanttype": schema.tekst(verplicht=True),
+    "oppervlakte": schema.getal(verplicht=True, min=0, max=100000),
+    "curing": schema.ja_nee(),
+    "meerwerk_uren": schema.getal(standaard=0, min=0, max=1000),
+    "meerwerk_toelichting": schema.tekst(standaard="", max_lengte=1000),
+    "materiaal_bedrag": schema.getal(standaard=0, min=0, max=1000000),
+    "materiaal_toelichting": schema.tekst(standaard="", max_lengte=1000),
+})
+
+
+def bereken_polijst_prijs(data):
+    """
+    Prijsberekening polijsten zonder Flask-request:
+    geeft (payload, statuscode) terug. Gebruikt door /api/polijst-price en de prijsexport.
+    """
 
-    data = request.json or {}
+    try:
+        data = POLIJST_SCHEMA(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
 
-    systeem = data.get("systeem")
-    klanttype = data.get("klanttype")
-    oppervlakte = data.get("oppervlakte")
+    systeem = data["systeem"]
+    klanttype = data["klanttype"]
+    oppervlakte = data["oppervlakte"]
 
-    curing = data.get("curing", False)
+    curing = data["curing"]
 
     # 🔥 NIEUW
-    meerwerk_uren = float(data.get("meerwerk_uren", 0) or 0)
-    meerwerk_toelichting = data.get("meerwerk_toelichting", "")
+    meerwerk_uren = data["meerwerk_uren"]
+    meerwerk_toelichting = data["meerwerk_toelichting"]
 
-    materiaal_bedrag = float(data.get("materiaal_bedrag", 0) or 0)
-    materiaal_toelichting = data.get("materiaal_toelichting", "")
+    materiaal_bedrag = data["materiaal_bedrag"]
+    materiaal_toelichting = data["materiaal_toelichting"]
 
     UURTARIEF = 120
     CURING_PRIJS_PER_M2 = 10
 
-    if not systeem or not klanttype or oppervlakte is None:
-        return jsonify({"error": "systeem, klanttype en oppervlakte verplicht"}), 400
+    snapshot = huidige_snapshot()
 
-    try:
-        oppervlakte = float(oppervlakte)
-    except (ValueError, TypeError):
-        return jsonify({"error": "ongeldige oppervlakte"}), 400
-
-    systeem_data = POLIJST_DATA.get("systemen", {}).get(systeem)
+    systeem_data = snapshot["polijst_data"].get("systemen", {}).get(systeem)
     if not systeem_data:
-        return jsonify({"error": "systeem niet gevonden"}), 404
+        metrics.tel_domeinfout("polijstsysteem_niet_gevonden")
+        return {"error": "systeem niet gevonden"}, 404
 
     prijzen = systeem_data.get("prijzen", {}).get(klanttype)
-    staffels = systeem_data.get("staffel", [])
     vast_index = systeem_data.get("vast_tot_index", -1)
 
     if not prijzen:
-        return jsonify({"error": "klanttype niet gevonden"}), 404
-
-    prijs = None
-    gekozen_index = None
+        return {"error": "klanttype niet gevonden"}, 404
 
-    for index, bereik in enumerate(staffels):
+    gekozen_index = zoek_staffel(snapshot["polijst_staffels"][systeem], oppervlakte)
 
-        if bereik.endswith("+"):
-            grens = float(bereik.replace("+", ""))
-            if oppervlakte >= grens:
-                prijs = prijzen[index]
-                gekozen_index = index
-                break
-        else:
-            min_m2, max_m2 = map(float, bereik.split("-"))
-            if min_m2 <= oppervlakte <= max_m2:
-                prijs = prijzen[index]
-                gekozen_index = index
-                break
+    if gekozen_index is None:
+        metrics.tel_domeinfout("geen_passende_staffel")
+        return {"error": "geen passende staffel"}, 400
 
-    if prijs is None:
-        return jsonify({"error": "geen passende staffel"}), 400
+    prijs = prijzen[gekozen_index]
 
     # =========================
     # BASISPRIJS
@@ -739,7 +1399,7 @@ def calculate_polijst_price():
     # =========================
     # RESPONSE
     # =========================
-    return jsonify({
+    return {
         "systeem": systeem,
         "klanttype": klanttype,
         "oppervlakte": oppervlakte,
@@ -748,56 +1408,233 @@ def calculate_polijst_price():
         "totaalprijs": totaalprijs,
         "omschrijving": systeem_data.get("omschrijving", []),
         "extras": extra_details
-    })
+    }, 200
+
+
+@app.route("/api/polijst-price", methods=["POST"])
+def calculate_polijst_price():
+    payload, status = bereken_polijst_prijs(request.get_json(silent=True))
+    return jsonify(payload), status
+
+
+# =========================
+# API: EXPORT PRIJSMATRIX (STREAMING)
+# =========================
+@app.route("/api/export/prijzen", methods=["GET"])
+def export_prijzen():
+    """
+    /api/export/prijzen?formaat=csv&m2=30,75,150
+
+    Volledige prijsmatrix als NDJSON (standaard) of CSV, rij voor rij gestreamd.
+    m2: optionele voorbeeldoppervlaktes, berekend met dezelfde prijsberekening.
+    """
+    formaat = request.args.get("formaat", "ndjson")
+    if formaat not in prijs_export.FORMATEN:
+        return jsonify({"error": f"formaat moet een van {list(prijs_export.FORMATEN)} zijn"}), 400
+
+    try:
+        oppervlaktes = prijs_export.parse_oppervlaktes(request.args.get("m2"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # snapshot nu vastzetten: de hele export komt uit dezelfde dataversie
+    snapshot = huidige_snapshot()
+
+    def rijen():
+        yield from prijs_export.matrix_rijen(snapshot)
+        if oppervlaktes:
+            yield from prijs_export.voorbeeld_rijen(
+                snapshot, oppervlaktes, bereken_coating_prijs, bereken_polijst_prijs
+            )
+
+    response = app.response_class(
+        stream_with_context(prijs_export.coderen(rijen(), formaat)),
+        mimetype=prijs_export.MIMETYPES[formaat]
+    )
+    response.headers["Content-Disposition"] = f'attachment; filename="prijzen.{formaat}"'
+    response.headers["X-Data-Versie"] = snapshot["versie"][:12]
+    return response
 
 
 # =========================
 # API: PLANNING
 # =========================
-@app.route("/api/planning", methods=["POST"])
-def planning_endpoint():
+PLANNING_SCHEMA = schema.compileer({
+    "systeem": schema.tekst(verplicht=True),
+    "m2": schema.getal(verplicht=True, min=0, max=100000),
+    "reistijd": schema.getal(standaard=0, min=0, max=1440),
+    "ruimtes": schema.geheel(standaard=1, min=1, max=100),
+    "meerwerk": MEERWERK_SCHEMA,
+    "heeft_hellingbaan": schema.ja_nee(),
 
-    data = request.json or {}
+    # "optimaal": dagindeling volgens de beperkingen uit tabellen_planning.json
+    "modus": schema.keuze(PLANNING_MODI, standaard="standaard"),
+    "doel": schema.keuze(DOELEN, standaard="dagen"),
+    "max_man": schema.geheel(min=1, max=100),
+})
 
-    systeem = data.get("systeem")
-    m2 = data.get("m2")
-    reistijd = data.get("reistijd", 0)
-    ruimtes = data.get("ruimtes", 1)
 
-    meerwerk = data.get("meerwerk", [])
-    heeft_hellingbaan = data.get("heeft_hellingbaan", False)  # 👈 NIEUW
+@app.route("/api/planning", methods=["POST"])
+def planning_endpoint():
 
-    if not systeem or m2 is None:
-        return jsonify({"error": "systeem en m2 verplicht"}), 400
+    try:
+        data = PLANNING_SCHEMA(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     try:
         planning = bereken_planning(
-            systemen=PLANNING_DATA["systemen"],
-            systeem_naam=systeem,
-            m2=float(m2),
-            reistijd_min=float(reistijd),
-            ruimtes=int(ruimtes),
-            meerwerk=meerwerk,
-            hellingbaan=heeft_hellingbaan  # 👈 NIEUW
+            planning=huidige_snapshot()["planning"],
+            systeem_naam=data["systeem"],
+            m2=data["m2"],
+            reistijd_min=data["reistijd"],
+            ruimtes=data["ruimtes"],
+            meerwerk=data["meerwerk"],
+            hellingbaan=data["heeft_hellingbaan"],  # 👈 NIEUW
+            modus=data["modus"],
+            doel=data["doel"],
+            max_man=data["max_man"]
         )
 
         return jsonify({"planning": planning}), 200
 
+    except ValueError as e:
+        # onbekend systeem, reistijd te hoog, past niet met max_man
+        metrics.tel_domeinfout("planning_fout")
+        return jsonify({"error": str(e)}), 400
+
     except Exception as e:
         print("❌ planning error:", e)
+        metrics.tel_domeinfout("planning_fout")
         return jsonify({"error": str(e)}), 500
 
 
+# =========================
+# API: CAPACITEIT (MEERDERE KLUSSEN EN PLOEGEN)
+# =========================
+
+MAX_CAPACITEIT_KLUSSEN = 300
+MAX_CAPACITEIT_PLOEGEN = 20
+MAX_CAPACITEIT_HORIZON = 260
+
+# per klus wordt per verschillende ploeggrootte een dagindeling berekend:
+# klussen × ploeggroottes begrenzen (300 × 5 ≈ 0,15 s)
+MAX_CAPACITEIT_DAGPLANNEN = 1500
+
+
+CAPACITEIT_SCHEMA = schema.compileer({
+    "start": schema.tekst(max_lengte=10),
+    "horizon": schema.geheel(standaard=STANDAARD_HORIZON, min=1),
+    "werkdagen": schema.lijst(schema.geheel(verplicht=True, min=0, max=6), 7),
+    "doel": schema.keuze(DOELEN, standaard="dagen"),
+    "ploegen": schema.lijst(
+        schema.object_({
+            "naam": schema.tekst(max_lengte=100),
+            "man": schema.geheel(verplicht=True, min=1, max=100),
+            "afwezig": schema.lijst(schema.tekst(verplicht=True, max_lengte=10), 366),
+        }, verplicht=True),
+        MAX_CAPACITEIT_PLOEGEN,
+        verplicht=True
+    ),
+    "klussen": schema.lijst(
+        schema.object_({
+            "id": schema.een_van(schema.tekst(verplicht=True, max_lengte=100), schema.geheel(verplicht=True), verplicht=False),
+            "systeem": schema.tekst(verplicht=True),
+            "m2": schema.getal(verplicht=True, min=0, max=100000),
+            "reistijd": schema.getal(standaard=0, min=0, max=1440),
+            "ruimtes": schema.geheel(standaard=1, min=1, max=100),
+            "vroegste_start": schema.tekst(max_lengte=10),
+            "heeft_hellingbaan": schema.ja_nee(),
+            "meerwerk": MEERWERK_SCHEMA,
+        }, verplicht=True),
+        MAX_CAPACITEIT_KLUSSEN
+    ),
+})
+
+
+@app.route("/api/capaciteit", methods=["POST"])
+def capaciteit_endpoint():
+    try:
+        data = CAPACITEIT_SCHEMA(request.get_json(silent=True))
+
+        doel = data["doel"]
+        start = parse_datum(data["start"], "start") if data["start"] else date.today()
+        horizon = min(data["horizon"], MAX_CAPACITEIT_HORIZON)
+        werkdagen = tuple(data["werkdagen"]) or STANDAARD_WERKDAGEN
+
+        ploegen = [
+            {
+                "naam": p["naam"] or f"ploeg {i + 1}",
+                "man": p["man"],
+                "afwezig": {parse_datum(d, "afwezig") for d in p["afwezig"]},
+            }
+            for i, p in enumerate(data["ploegen"])
+        ]
+
+        if len({p["naam"] for p in ploegen}) != len(ploegen):
+            raise ValueError("ploegnamen moeten uniek zijn")
+
+        expliciete_ids = [k["id"] for k in data["klussen"] if k["id"] is not None]
+        bezette_ids = set(expliciete_ids)
+        if len(bezette_ids) != len(expliciete_ids):
+            raise ValueError("klus-ids moeten uniek zijn")
+
+        def standaard_id(i):
+            # volgnummer, tenzij een andere klus dat nummer al expliciet als id heeft
+            return i + 1 if i + 1 not in bezette_ids else f"klus {i + 1}"
+
+        klussen = [
+            dict(
+                k,
+                id=k["id"] if k["id"] is not None else standaard_id(i),
+                vroegste_start=parse_datum(k["vroegste_start"], "vroegste_start") if k["vroegste_start"] else start,
+            )
+            for i, k in enumerate(data["klussen"])
+        ]
+
+    except ValueError as e:
+        return jsonify({"error": f"ongeldige invoer: {e}"}), 400
+
+    # ❌ te veel rekenwerk voor één request
+    dagplannen = len(klussen) * len({p["man"] for p in ploegen})
+    if dagplannen > MAX_CAPACITEIT_DAGPLANNEN:
+        return jsonify({
+            "error": f"te veel werk: {len(klussen)} klussen × ploeggroottes is meer dan "
+                     f"{MAX_CAPACITEIT_DAGPLANNEN} dagplannen; splits de aanvraag"
+        }), 413
+
+    planning_snapshot = huidige_snapshot()["planning"]
+
+    def dagplan(klus, max_man):
+        return bereken_planning(
+            planning=planning_snapshot,
+            systeem_naam=klus["systeem"],
+            m2=klus["m2"],
+            reistijd_min=klus["reistijd"],
+            ruimtes=klus["ruimtes"],
+            meerwerk=klus["meerwerk"],
+            hellingbaan=klus["heeft_hellingbaan"],
+            modus="optimaal",
+            doel=doel,
+            max_man=max_man
+        )
+
+    resultaat = plan_capaciteit(klussen, ploegen, dagplan, start, horizon, werkdagen)
+
+    if resultaat["niet_ingepland"]:
+        metrics.tel_domeinfout("capaciteit_niet_ingepland")
+
+    return jsonify(resultaat), 200
 
 
 # =========================
 # API: MATERIALEN (BESTELLIJST)
 # =========================
-@app.route("/api/materialen", methods=["POST"])
-def bereken_materialen():
+def bereken_bestellijst(fases, prijs_data=None):
+    """Materialen (kg per product) voor een lijst fases zonder Flask-request."""
 
-    data = request.json or {}
-    fases = data.get("fases", [])
+    if prijs_data is None:
+        prijs_data = huidige_snapshot()["prijs_data"]
 
     materialen = {}
 
@@ -818,7 +1655,7 @@ def bereken_materialen():
         # 🔑 Systeemnaam normaliseren
         systeem_key = str(systeem).replace("Sys:", "").strip()
 
-        systeem_data = PRIJS_DATA.get("systemen", {}).get(systeem_key)
+        systeem_data = prijs_data.get("systemen", {}).get(systeem_key)
         if not systeem_data:
             continue
 
@@ -831,7 +1668,7 @@ def bereken_materialen():
                 continue
 
             # 🔥 PRODUCT DATA UIT JSON
-            product_data = PRIJS_DATA.get("producten", {}).get(product, {})
+            product_data = prijs_data.get("producten", {}).get(product, {})
             verpakkingen = product_data.get("verpakkingen", [])
             kleur_verplicht = product_data.get("kleur_verplicht", False)
 
@@ -845,11 +1682,196 @@ def bereken_materialen():
 
             materialen[product]["kg"] += kg
 
+    # 🔥 verpakkingen kiezen op het totaal over alle fases
+    producten = prijs_data.get("producten", {})
+
+    for product, regel in materialen.items():
+        regel["bestelling"] = optimaliseer_verpakkingen(
+            regel["kg"],
+            regel["verpakkingen"],
+            producten.get(product, {}).get("max_klein")
+        )
+
+    return materialen
+
+
+MATERIALEN_SCHEMA = schema.compileer({
+    "fases": schema.lijst(
+        schema.object_({
+            "gekozenSysteem": schema.tekst(),
+            "gekozenOppervlakte": schema.getal(min=0, max=100000),
+            "kleur": schema.tekst(),
+        }, verplicht=True),
+        MAX_FASES
+    ),
+})
+
+
+@app.route("/api/materialen", methods=["POST"])
+def bereken_materialen():
+
+    try:
+        data = MATERIALEN_SCHEMA(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     return jsonify({
-        "materialen": materialen
+        "materialen": bereken_bestellijst(data["fases"])
     }), 200
 
 
+# =========================
+# API: QUOTE (BOOM + PRIJS + PLANNING + BESTELLIJST)
+# =========================
+
+# velden die ongewijzigd naar de prijsberekening gaan
+QUOTE_PRIJS_VELDEN = (
+    "xtr_coating_verwijderen_uren",
+    "meerwerk_uren",
+    "meerwerk_toelichting",
+    "materiaal_bedrag",
+    "materiaal_toelichting",
+)
+
+
+def voeg_uniek_toe(lijst, waarden):
+    for waarde in waarden:
+        if waarde not in lijst:
+            lijst.append(waarde)
+    return lijst
+
+
+QUOTE_SCHEMA = schema.compileer({
+    "node_id": schema.tekst(standaard="BFC", max_lengte=50),
+    "choices": schema.lijst(schema.geheel(verplicht=True, min=0), MAX_PAD_STAPPEN),
+    "systeem": schema.tekst(),
+    "oppervlakte": schema.getal(verplicht=True, min=0, max=100000),
+    "ruimtes": schema.geheel(standaard=1, min=1, max=100),
+    "reistijd": schema.getal(standaard=0, min=0, max=1440),
+    "kleur": schema.tekst(),
+    "heeft_hellingbaan": schema.ja_nee(standaard=None),
+    "extras": EXTRAS_SCHEMA,
+    "forced_extras": schema.lijst(schema.tekst(verplicht=True, max_lengte=100), MAX_EXTRAS),
+    "meerwerk": MEERWERK_SCHEMA,
+    "xtr_coating_verwijderen_uren": schema.getal(standaard=0, min=0, max=1000),
+    "meerwerk_uren": schema.getal(standaard=0, min=0, max=1000),
+    "meerwerk_toelichting": schema.tekst(standaard="", max_lengte=1000),
+    "materiaal_bedrag": schema.getal(standaard=0, min=0, max=1000000),
+    "materiaal_toelichting": schema.tekst(standaard="", max_lengte=1000),
+})
+
+
+@app.route("/api/quote", methods=["POST"])
+def quote_endpoint():
+    """
+    Eén complete offerte: (optioneel) keuzes door de boom, dan prijs, planning
+    en bestellijst vanuit één gedeelde, één keer gevalideerde context.
+    """
+    ruw = request.get_json(silent=True)
+
+    try:
+        data = QUOTE_SCHEMA(ruw)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # =========================
+    # 1️⃣ BOOM (optioneel)
+    # =========================
+    pad = None
+    systeem = data.get("systeem")
+
+    # lege lijst = wel door de boom (vanaf node_id), zoals voorheen
+    if isinstance(ruw, dict) and ruw.get("choices") is not None:
+        pad, fout = loop_pad(data["node_id"], data["choices"])
+        if fout:
+            return jsonify(fout[0]), fout[1]
+
+        systeem = systeem or pad["systeem"]
+
+    if not systeem:
+        return jsonify({"error": "geen systeem opgegeven of bereikt"}), 400
+
+    # =========================
+    # 2️⃣ GEDEELDE CONTEXT
+    # =========================
+    oppervlakte = data["oppervlakte"]
+    ruimtes = data["ruimtes"]
+    reistijd = data["reistijd"]
+
+    snapshot = huidige_snapshot()
+    systeem_key = str(systeem).replace("Sys:", "").strip()
+
+    gezet = pad["set"] if pad else {}
+    heeft_hellingbaan = data["heeft_hellingbaan"]
+    if heeft_hellingbaan is None:
+        heeft_hellingbaan = gezet.get("heeftHellingbaan", False)
+
+    extras = voeg_uniek_toe(data["extras"], pad["chosen_extra"] if pad else [])
+    forced_extras = voeg_uniek_toe(data["forced_extras"], pad["forced_extras"] if pad else [])
+
+    # =========================
+    # 3️⃣ PRIJS / PLANNING / BESTELLIJST
+    # =========================
+    prijs_aanvraag = {
+        "systeem": systeem_key,
+        "oppervlakte": oppervlakte,
+        "ruimtes": ruimtes,
+        "heeft_hellingbaan": heeft_hellingbaan,
+        "extras": extras,
+        "forced_extras": forced_extras,
+    }
+    for veld in QUOTE_PRIJS_VELDEN:
+        prijs_aanvraag[veld] = data[veld]
+
+    prijs, prijs_status = bereken_coating_prijs(prijs_aanvraag)
+
+    try:
+        planning = bereken_planning(
+            planning=snapshot["planning"],
+            systeem_naam=systeem_key,
+            m2=oppervlakte,
+            reistijd_min=reistijd,
+            ruimtes=ruimtes,
+            meerwerk=data["meerwerk"],
+            hellingbaan=heeft_hellingbaan
+        )
+    except ValueError as e:
+        metrics.tel_domeinfout("planning_fout")
+        planning = {"error": str(e)}
+
+    bestellijst = bereken_bestellijst(
+        [{"gekozenSysteem": systeem_key, "gekozenOppervlakte": oppervlakte, "kleur": data["kleur"]}],
+        snapshot["prijs_data"]
+    )
+
+    antwoord = {
+        "systeem": systeem_key,
+        "prijs": prijs,
+        "prijs_status": prijs_status,
+        "planning": planning,
+        "materialen": bestellijst
+    }
+
+    if pad:
+        antwoord["pad"] = pad["pad"]
+        antwoord["set"] = pad["set"]
+        antwoord["chosen_extra"] = pad["chosen_extra"]
+        antwoord["forced_extras"] = pad["forced_extras"]
+
+    return jsonify(antwoord), 200
+
+
+
+
+# =========================
+# METRICS (PROMETHEUS)
+# =========================
+@app.route("/metrics")
+def metrics_endpoint():
+    return app.response_class(
+        metrics.prometheus_tekst(),
+        content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 # =========================
@@ -0,0 +1,189 @@
+"""
+ASGI-ingang voor de keuzegids-API.
+
+    pip install uvicorn
+    uvicorn asgi:app --workers 4
+    gunicorn -k uvicorn.workers.UvicornWorker asgi:app
+
+Zelfde routes en responses als App.py: elk request gaat door de Flask-app,
+maar het inlezen van de body en het versturen van de response gebeurt in de
+event loop. Een trage (mobiele) verbinding houdt dus geen thread bezet;
+alleen het eigenlijke werk draait in een begrensde threadpool. Zware routes
+(bulkprijzen, planning, offertes) hebben een eigen, kleinere pool zodat ze
+de boomnavigatie niet kunnen verdringen.
+"""
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from App import app as flask_app
+
+ASGI_THREADS = int(os.environ.get("ASGI_THREADS", 16))
+ASGI_ZWARE_THREADS = int(os.environ.get("ASGI_ZWARE_THREADS", 2))
+
+# groter → 413 zonder de Flask-app aan te roepen
+MAX_BODY_BYTES = int(os.environ.get("MAX_BODY_BYTES", 10 * 1024 * 1024))
+
+ZWARE_ROUTES = (
+    "/api/price/batch",
+    "/api/price/curve",
+    "/api/planning",
+    "/api/capaciteit",
+    "/api/quote",
+    "/api/export",
+)
+
+_licht = ThreadPoolExecutor(max_workers=ASGI_THREADS, thread_name_prefix="asgi")
+_zwaar = ThreadPoolExecutor(max_workers=ASGI_ZWARE_THREADS, thread_name_prefix="asgi-zwaar")
+
+
+def _executor(pad):
+    return _zwaar if pad.startswith(ZWARE_ROUTES) else _licht
+
+
+def _environ(scope, body):
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]) if server[1] is not None else "80",
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+
+    for naam, waarde in scope.get("headers", []):
+        naam = naam.decode("latin-1").upper().replace("-", "_")
+        waarde = waarde.decode("latin-1")
+
+        if naam == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = waarde
+            continue
+        if naam == "CONTENT_LENGTH":
+            continue
+
+        sleutel = "HTTP_" + naam
+        environ[sleutel] = f"{environ[sleutel]},{waarde}" if sleutel in environ else waarde
+
+    return environ
+
+
+def _start_wsgi(environ):
+    """Draait de Flask-app tot de eerste chunk: (status, headers, eerste chunk, iterator)."""
+    antwoord = {}
+
+    def start_response(status, headers, exc_info=None):
+        antwoord["status"] = int(status.split(" ", 1)[0])
+        antwoord["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+
+    iterable = flask_app(environ, start_response)
+    iterator = iter(iterable)
+    eerste = next(iterator, b"")
+
+    return antwoord["status"], antwoord["headers"], eerste, iterator, iterable
+
+
+def _volgende_chunk(iterator):
+    return next(iterator, None)
+
+
+async def _lees_body(receive):
+    delen = []
+    grootte = 0
+
+    while True:
+        bericht = await receive()
+
+        if bericht["type"] == "http.disconnect":
+            return None
+
+        deel = bericht.get("body", b"")
+        grootte += len(deel)
+        if grootte > MAX_BODY_BYTES:
+            return False
+
+        delen.append(deel)
+        if not bericht.get("more_body"):
+            return b"".join(delen)
+
+
+async def _fout(send, status, tekst):
+    body = tekst.encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        bericht = await receive()
+        if bericht["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif bericht["type"] == "lifespan.shutdown":
+            _licht.shutdown(wait=False)
+            _zwaar.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    if scope["type"] != "http":
+        raise RuntimeError(f"niet ondersteund ASGI-type: {scope['type']}")
+
+    # 1️⃣ body volledig inlezen in de event loop (geen thread bezet)
+    body = await _lees_body(receive)
+    if body is None:
+        return
+    if body is False:
+        await _fout(send, 413, "request te groot")
+        return
+
+    # 2️⃣ de Flask-app in de threadpool
+    loop = asyncio.get_running_loop()
+    executor = _executor(scope["path"])
+
+    status, headers, eerste, iterator, iterable = await loop.run_in_executor(
+        executor, _start_wsgi, _environ(scope, body)
+    )
+
+    # 3️⃣ response versturen vanuit de event loop; streaming responses chunk voor chunk
+    try:
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+
+        # gewone Flask-response: alles zit in de eerste chunk
+        lengte = dict(headers).get(b"content-length")
+        if lengte is not None and int(lengte) == len(eerste):
+            await send({"type": "http.response.body", "body": eerste})
+            return
+
+        chunk = eerste
+        while chunk is not None:
+            volgende = await loop.run_in_executor(executor, _volgende_chunk, iterator)
+            await send({"type": "http.response.body", "body": chunk, "more_body": volgende is not None})
+            chunk = volgende
+
+    finally:
+        if hasattr(iterable, "close"):
+            await loop.run_in_executor(executor, iterable.close)
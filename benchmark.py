@@ -0,0 +1,319 @@
+"""
+Benchmarks voor de keuzegids-backend.
+
+Meet de kernfuncties uit App.py direct én via de Flask test-client, met een
+realistische mix: willekeurige geldige paden door keuzeboom.json en een
+log-normale m²-verdeling (mediaan ±120 m², 30–1000 m²).
+
+    python benchmark.py                         # alles, resultaat naar benchmark_resultaten/
+    python benchmark.py --filter price          # alleen benchmarks met 'price' in de naam
+    python benchmark.py --vergelijk oud.json    # vergelijken met een eerdere run
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# geen watcher-thread tijdens het meten
+os.environ.setdefault("DATA_RELOAD_INTERVAL", "0")
+
+import App  # noqa: E402
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+KLANTTYPES = ["Particulieren", "Aannemer", "Vloerenlegger"]
+
+
+# =========================
+# REQUEST-MIX
+# =========================
+def willekeurige_m2(rng):
+    return round(min(max(rng.lognormvariate(4.8, 0.7), 30), 1000), 1)
+
+
+def willekeurige_ruimtes(rng):
+    return rng.choices([1, 2, 3], weights=[70, 20, 10])[0]
+
+
+def willekeurige_paden(rng, snapshot, aantal):
+    """(node_id, choice)-stappen van willekeurige wandelingen vanaf BFC."""
+    boom = snapshot["boom"]
+    stappen = []
+
+    while len(stappen) < aantal:
+        node = boom["nodes"][App.data_snapshot.START_NODE]
+
+        for _ in range(50):
+            kinderen = node.get("next", [])
+            if not kinderen or node.get("type") == "systeem":
+                break
+
+            keuze = rng.randrange(len(kinderen))
+            volgende = App.get_node(kinderen[keuze])
+            if volgende is None:
+                break
+
+            stappen.append((node["id"], keuze))
+            node = volgende
+
+    return stappen[:aantal]
+
+
+def bouw_mix(seed, aantal):
+    rng = random.Random(seed)
+    snapshot = App.data_snapshot.actueel()
+
+    coating = list(snapshot["prijs_data"]["systemen"])
+    polijst = list(snapshot["polijst_data"]["systemen"])
+    planning = [s["naam"] for s in snapshot["planning_data"]["systemen"]]
+    extras = list(snapshot["prijs_data"].get("extras", {})) + list(snapshot["prijs_data"].get("extra_systemen", {}))
+
+    mix = {
+        "stappen": willekeurige_paden(rng, snapshot, aantal),
+        "prijs": [],
+        "polijst": [],
+        "planning": [],
+        "materialen": [],
+    }
+
+    for _ in range(aantal):
+        m2 = willekeurige_m2(rng)
+        ruimtes = willekeurige_ruimtes(rng)
+        systeem = rng.choice(coating)
+
+        mix["prijs"].append({
+            "systeem": "Sys: " + systeem,
+            "oppervlakte": m2,
+            "ruimtes": ruimtes,
+            "heeft_hellingbaan": rng.random() < 0.1,
+            "extras": rng.sample(extras, k=rng.randint(0, 2)),
+        })
+        mix["polijst"].append({
+            "systeem": rng.choice(polijst),
+            "klanttype": rng.choice(KLANTTYPES),
+            "oppervlakte": round(rng.uniform(11, 100), 1),
+            "curing": rng.random() < 0.3,
+        })
+        mix["planning"].append({
+            "systeem": rng.choice(planning),
+            "m2": m2,
+            "reistijd": rng.choice([15, 30, 45, 60, 90]),
+            "ruimtes": ruimtes,
+            "heeft_hellingbaan": rng.random() < 0.1,
+        })
+        mix["materialen"].append({
+            "fases": [
+                {"gekozenSysteem": "Sys: " + rng.choice(coating), "gekozenOppervlakte": willekeurige_m2(rng)}
+                for _ in range(rng.randint(1, 3))
+            ]
+        })
+
+    return mix
+
+
+# =========================
+# BENCHMARKS
+# =========================
+def benchmarks(mix):
+    """naam → functie(i) die één operatie uitvoert."""
+    client = App.app.test_client()
+    app = App.app
+
+    stappen = mix["stappen"]
+    nodes = [App.get_node(node_id) for node_id, _ in stappen]
+
+    def view(functie, payloads):
+        def run(i):
+            with app.test_request_context(method="POST", json=payloads[i]):
+                functie()
+        return run
+
+    # echte boompayloads voor de serializer-vergelijking
+    start_all = App.expand_node(nodes[0], None)
+    start_d2 = App.expand_node(App.get_node(App.data_snapshot.START_NODE), App.DEFAULT_DEPTH)
+    next_d2 = [App.expand_node(node, App.DEFAULT_DEPTH) for node in nodes]
+
+    def expand_koud(i):
+        App.huidige_snapshot()["expand_cache"].clear()
+        App.expand_node(nodes[i], App.DEFAULT_DEPTH)
+
+    return {
+        # direct
+        "get_node": lambda i: App.get_node(stappen[i][0]),
+        "expand_node_depth2_warm": lambda i: App.expand_node(nodes[i], App.DEFAULT_DEPTH),
+        "expand_node_depth2_koud": expand_koud,
+        "expand_node_start_all": lambda i: App.expand_node(nodes[0], None),
+        "calculate_price": lambda i: App.bereken_coating_prijs(mix["prijs"][i]),
+        "calculate_polijst_price": view(App.calculate_polijst_price, mix["polijst"]),
+        "bereken_planning": lambda i: App.bereken_planning(
+            planning=App.huidige_snapshot()["planning"],
+            systeem_naam=mix["planning"][i]["systeem"],
+            m2=mix["planning"][i]["m2"],
+            reistijd_min=mix["planning"][i]["reistijd"],
+            ruimtes=mix["planning"][i]["ruimtes"],
+            hellingbaan=mix["planning"][i]["heeft_hellingbaan"],
+        ),
+        "bereken_planning_optimaal": lambda i: App.bereken_planning(
+            planning=App.huidige_snapshot()["planning"],
+            systeem_naam=mix["planning"][i]["systeem"],
+            m2=mix["planning"][i]["m2"],
+            reistijd_min=mix["planning"][i]["reistijd"],
+            ruimtes=mix["planning"][i]["ruimtes"],
+            hellingbaan=mix["planning"][i]["heeft_hellingbaan"],
+            modus="optimaal",
+        ),
+        "bereken_materialen": view(App.bereken_materialen, mix["materialen"]),
+
+        # serializer: stdlib (Flask-standaard) tegenover de snelle encoder
+        "json_stdlib_start_depth2": lambda i: App.serialisatie.stdlib_dumps(start_d2),
+        "json_snel_start_depth2": lambda i: App.serialisatie.dumps(start_d2),
+        "json_stdlib_next_depth2": lambda i: App.serialisatie.stdlib_dumps(next_d2[i]),
+        "json_snel_next_depth2": lambda i: App.serialisatie.dumps(next_d2[i]),
+        "json_stdlib_start_all": lambda i: App.serialisatie.stdlib_dumps(start_all),
+        "json_snel_start_all": lambda i: App.serialisatie.dumps(start_all),
+
+        # via de Flask test-client
+        "http_start": lambda i: client.get("/api/start"),
+        "http_next": lambda i: client.post("/api/next", json={"node_id": stappen[i][0], "choice": stappen[i][1]}),
+        "http_next_get": lambda i: client.get(f"/api/next?node_id={stappen[i][0]}&choice={stappen[i][1]}"),
+        "http_price": lambda i: client.post("/api/price", json=mix["prijs"][i]),
+        "http_price_batch_100": lambda i: client.post("/api/price/batch", json=mix["prijs"][:100]),
+        "http_polijst_price": lambda i: client.post("/api/polijst-price", json=mix["polijst"][i]),
+        "http_planning": lambda i: client.post("/api/planning", json=mix["planning"][i]),
+        "http_materialen": lambda i: client.post("/api/materialen", json=mix["materialen"][i]),
+    }
+
+
+def percentiel(waarden, p):
+    index = min(len(waarden) - 1, int(round(p / 100 * (len(waarden) - 1))))
+    return waarden[index]
+
+
+def meet(functie, aantal, opwarmen):
+    for i in range(min(opwarmen, aantal)):
+        functie(i)
+
+    tijden = []
+    totaal_start = time.perf_counter_ns()
+
+    for i in range(aantal):
+        start = time.perf_counter_ns()
+        functie(i)
+        tijden.append(time.perf_counter_ns() - start)
+
+    totaal_ns = time.perf_counter_ns() - totaal_start
+    tijden.sort()
+
+    # allocaties in een aparte ronde: tracemalloc vertraagt de metingen zelf
+    alloc_rondes = max(1, aantal // 10)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    voor, _ = tracemalloc.get_traced_memory()
+    blokken_voor = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+
+    for i in range(alloc_rondes):
+        functie(i)
+
+    na, piek = tracemalloc.get_traced_memory()
+    blokken_na = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+
+    return {
+        "n": aantal,
+        "ops_per_s": round(aantal / (totaal_ns / 1e9), 1),
+        "p50_us": round(percentiel(tijden, 50) / 1000, 2),
+        "p99_us": round(percentiel(tijden, 99) / 1000, 2),
+        "gemiddeld_us": round(sum(tijden) / len(tijden) / 1000, 2),
+        "alloc_piek_kb": round((piek - voor) / 1024, 2),
+        "alloc_blijvend_bytes_per_op": round((na - voor) / alloc_rondes, 1),
+        "alloc_blijvend_blokken_per_op": round((blokken_na - blokken_voor) / alloc_rondes, 2),
+    }
+
+
+# =========================
+# OPSLAAN / VERGELIJKEN
+# =========================
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def vergelijk(oud_pad, resultaten):
+    with open(oud_pad, encoding="utf-8") as f:
+        oud = json.load(f)["resultaten"]
+
+    print(f"\n{'benchmark':32} {'oud ops/s':>12} {'nieuw ops/s':>12} {'factor':>8}")
+    for naam, nieuw in resultaten.items():
+        if naam not in oud:
+            continue
+        factor = nieuw["ops_per_s"] / oud[naam]["ops_per_s"] if oud[naam]["ops_per_s"] else float("inf")
+        print(f"{naam:32} {oud[naam]['ops_per_s']:>12} {nieuw['ops_per_s']:>12} {factor:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks keuzegids-backend")
+    parser.add_argument("-n", "--aantal", type=int, default=2000, help="operaties per benchmark")
+    parser.add_argument("--opwarmen", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--filter", default="", help="alleen benchmarks met deze tekst in de naam")
+    parser.add_argument("-o", "--output", help="JSON-bestand voor de resultaten")
+    parser.add_argument("--vergelijk", help="eerder resultaat-JSON om mee te vergelijken")
+    args = parser.parse_args()
+
+    mix = bouw_mix(args.seed, args.aantal)
+    resultaten = {}
+
+    print(f"{'benchmark':32} {'ops/s':>12} {'p50 µs':>10} {'p99 µs':>10} {'piek KB':>11}")
+
+    for naam, functie in benchmarks(mix).items():
+        if args.filter not in naam:
+            continue
+
+        # hele-boom-expansie is zwaar: minder herhalingen
+        aantal = min(args.aantal, 50) if naam.endswith("_all") or "batch" in naam or "koud" in naam else args.aantal
+
+        r = meet(functie, aantal, args.opwarmen)
+        resultaten[naam] = r
+        print(f"{naam:32} {r['ops_per_s']:>12} {r['p50_us']:>10} {r['p99_us']:>10} {r['alloc_piek_kb']:>11}")
+
+    uitvoer = {
+        "meta": {
+            "datum": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "data_versie": App.data_snapshot.actueel()["versie"][:12],
+            "json_encoder": App.serialisatie.ENCODER,
+            "seed": args.seed,
+            "aantal": args.aantal,
+        },
+        "resultaten": resultaten,
+    }
+
+    pad = args.output
+    if not pad:
+        map_ = os.path.join(BASE_DIR, "benchmark_resultaten")
+        os.makedirs(map_, exist_ok=True)
+        pad = os.path.join(map_, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+
+    with open(pad, "w", encoding="utf-8") as f:
+        json.dump(uitvoer, f, indent=2, ensure_ascii=False)
+
+    print(f"\nResultaten opgeslagen in {pad}")
+
+    if args.vergelijk:
+        vergelijk(args.vergelijk, resultaten)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+from boom_index import normaliseer
+
+# =========================
+# BEREIKBAARHEID (WELKE SYSTEMEN ZIJN NOG MOGELIJK)
+# =========================
+# Per node wordt bij het laden vastgelegd welke systeem- en afw-nodes er nog
+# bereikbaar zijn, en hoeveel vragen er minimaal/maximaal nog komen.
+# De sets zijn bitsets (Python ints) over een vaste volgorde van de systeem-
+# en afw-nodes: doorsnede/vereniging is daarna één & of | per set.
+
+
+def bits_naar_posities(bits):
+    posities = []
+    while bits:
+        laagste = bits & -bits
+        posities.append(laagste.bit_length() - 1)
+        bits ^= laagste
+    return posities
+
+
+def _postorder(boom):
+    """Node-ids zo geordend dat kinderen vóór hun ouders komen; ValueError bij een cyclus."""
+    WIT, GRIJS, ZWART = 0, 1, 2
+    kleur = dict.fromkeys(boom["nodes"], WIT)
+    volgorde = []
+
+    def kind_ids(node_id):
+        return [str(child.get("id")) for child, inline in boom["kinderen"][node_id] if not inline]
+
+    for begin in boom["nodes"]:
+        if kleur[begin] != WIT:
+            continue
+
+        kleur[begin] = GRIJS
+        pad = [begin]
+        stapel = [iter(kind_ids(begin))]
+
+        while stapel:
+            volgende = next(stapel[-1], None)
+
+            if volgende is None:
+                node_id = pad.pop()
+                kleur[node_id] = ZWART
+                volgorde.append(node_id)
+                stapel.pop()
+                continue
+
+            if kleur[volgende] == GRIJS:
+                raise ValueError(f"keuzeboom bevat een cyclus via '{volgende}'")
+
+            if kleur[volgende] == WIT:
+                kleur[volgende] = GRIJS
+                pad.append(volgende)
+                stapel.append(iter(kind_ids(volgende)))
+
+    return volgorde
+
+
+def compileer_bereikbaarheid(boom):
+    """
+    Op basis van compileer_boom():
+       - systemen / afwijkingen: bitpositie → node-id
+       - systeem_bits / afw_bits: node-id → bitset van bereikbare nodes (incl. zichzelf)
+       - vragen_min / vragen_max: node-id → nog te beantwoorden vragen (incl. zichzelf)
+       - hoogte: langste pad (in stappen) vanaf een willekeurige node; een depth
+         vanaf deze waarde geeft dus altijd de volledige subboom
+       - antwoorden: (vraag-id, vraagtekst, antwoord-id, antwoordtekst) genormaliseerd,
+         voor het zoeken op beperkingen
+    """
+    nodes = boom["nodes"]
+
+    systemen = tuple(node_id for node_id, node in nodes.items() if node.get("type") == "systeem")
+    afwijkingen = tuple(node_id for node_id, node in nodes.items() if node.get("type") == "afw")
+    systeem_bit = {node_id: 1 << i for i, node_id in enumerate(systemen)}
+    afw_bit = {node_id: 1 << i for i, node_id in enumerate(afwijkingen)}
+
+    systeem_bits = {}
+    afw_bits = {}
+    vragen_min = {}
+    vragen_max = {}
+    hoogtes = {}
+
+    # kinderen zijn altijd eerder berekend (postorder)
+    for node_id in _postorder(boom):
+        s = systeem_bit.get(node_id, 0)
+        a = afw_bit.get(node_id, 0)
+        kind_min = []
+        kind_max = []
+        hoogte = 0
+
+        for child, inline in boom["kinderen"][node_id]:
+            if inline:
+                continue
+            kind_id = str(child.get("id"))
+            s |= systeem_bits[kind_id]
+            a |= afw_bits[kind_id]
+            kind_min.append(vragen_min[kind_id])
+            kind_max.append(vragen_max[kind_id])
+            hoogte = max(hoogte, hoogtes[kind_id] + 1)
+
+        eigen = 1 if nodes[node_id].get("type") == "vraag" else 0
+        systeem_bits[node_id] = s
+        afw_bits[node_id] = a
+        vragen_min[node_id] = eigen + min(kind_min, default=0)
+        vragen_max[node_id] = eigen + max(kind_max, default=0)
+        hoogtes[node_id] = hoogte
+
+    antwoorden = []
+    for node_id, node in nodes.items():
+        if node.get("type") != "vraag":
+            continue
+
+        for child, inline in boom["kinderen"][node_id]:
+            if inline or child.get("type") != "antwoord":
+                continue
+            antwoorden.append((
+                node_id,
+                normaliseer(node.get("text", "")),
+                str(child.get("id")),
+                normaliseer(boom["antwoorden"][str(child.get("id"))]),
+            ))
+
+    return {
+        "systemen": systemen,
+        "afwijkingen": afwijkingen,
+        "systeem_bits": systeem_bits,
+        "afw_bits": afw_bits,
+        "vragen_min": vragen_min,
+        "vragen_max": vragen_max,
+        "hoogte": max(hoogtes.values(), default=0),
+        "antwoorden": tuple(antwoorden),
+    }
+
+
+def zoek_antwoorden(index, vraag=None, antwoord=None, antwoord_id=None):
+    """
+    Antwoord-nodes die bij een beperking passen:
+    - antwoord_id: precies die node
+    - vraag + antwoord: vraagtekst bevat `vraag` (of is de vraag-id),
+      antwoordtekst is gelijk aan `antwoord`; hoofdletters/accenten tellen niet
+    """
+    if antwoord_id is not None:
+        return [a_id for _, _, a_id, _ in index["antwoorden"] if a_id == antwoord_id]
+
+    vraag_n = normaliseer(vraag)
+    antwoord_n = normaliseer(antwoord)
+
+    return [
+        a_id
+        for v_id, v_tekst, a_id, a_tekst in index["antwoorden"]
+        if (v_id == vraag or vraag_n in v_tekst) and a_tekst == antwoord_n
+    ]
+
+
+def doorsnede(index, start_id, beperkingen):
+    """
+    Systemen/afwijkingen die vanaf start_id bereikbaar zijn via een pad dat
+    langs een passend antwoord van élke beperking gaat.
+    beperkingen: lijst van lijsten antwoord-ids (één lijst per beperking).
+    Een antwoord dat al vóór start_id ligt telt als gegeven: dan blijft alles
+    over wat vanaf start_id nog onder dat antwoord hangt.
+    """
+    s = index["systeem_bits"][start_id]
+    a = index["afw_bits"][start_id]
+
+    for antwoord_ids in beperkingen:
+        s_beperking = 0
+        a_beperking = 0
+        for antwoord_id in antwoord_ids:
+            s_beperking |= index["systeem_bits"][antwoord_id]
+            a_beperking |= index["afw_bits"][antwoord_id]
+
+        s &= s_beperking
+        a &= a_beperking
+
+    return s, a
@@ -0,0 +1,97 @@
+import json
+import re
+import unicodedata
+
+# =========================
+# KEUZEBOOM INDEX (GEDEELD)
+# =========================
+# Wordt gebruikt door App.py, keuzegids.py en keuzegids_api.py.
+# De boom wordt één keer bij het laden gecompileerd; lookups zijn daarna O(1).
+
+
+def clean_answer(txt):
+    """Verwijder 'Antw:' of 'Sys:' of 'Xtr:'."""
+    return re.sub(r"^(Antw:|Sys:|Xtr:)\s*", "", txt).strip()
+
+
+def normaliseer(txt):
+    """'Vrg: Is de vloer geïsoleerd?' → 'is de vloer geisoleerd?'"""
+    txt = re.sub(r"^(Vrg:|Antw:|Sys:|Xtr:|Afw:)\s*", "", str(txt).strip())
+    txt = unicodedata.normalize("NFKD", txt)
+    txt = "".join(c for c in txt if not unicodedata.combining(c)).replace("’", "'")
+    return " ".join(txt.casefold().split())
+
+
+def extract_answer_value(node):
+    """Converteert antwoordtekst:
+       'Antw: nee' → 'nee'
+       'J/N: ja'  → 'ja'
+       'A/B: droog' → 'droog'
+    """
+    txt = node.get("text", "").strip()
+    if ":" in txt:
+        return txt.split(":", 1)[1].strip()
+    return txt
+
+
+def extract_system_name(node):
+    """Haalt systeemnaam uit:
+       'Sys: DOS Basic' → 'DOS Basic'
+    """
+    raw = node.get("text", "").strip()
+    if ":" in raw:
+        return raw.split(":", 1)[1].strip()
+    return raw
+
+
+def compileer_boom(nodes):
+    """Bouwt de index over de keuzeboom-lijst:
+       - nodes:      id → node
+       - kinderen:   id → tuple van (child, inline); child is de opgeloste node of
+                     de inline dict, onbekende ids vallen weg (net als in expand_node)
+       - teksten:    id → clean_answer(text)
+       - antwoorden: id → extract_answer_value(node)
+    """
+    index = {}
+    for node in nodes:
+        index.setdefault(str(node.get("id")), node)
+
+    kinderen = {}
+    teksten = {}
+    antwoorden = {}
+
+    for node_id, node in index.items():
+        opgelost = []
+        for child in node.get("next", []):
+            if isinstance(child, dict):
+                opgelost.append((child, True))
+                continue
+
+            child_node = index.get(str(child))
+            if child_node is not None:
+                opgelost.append((child_node, False))
+
+        kinderen[node_id] = tuple(opgelost)
+        teksten[node_id] = clean_answer(node.get("text", ""))
+        antwoorden[node_id] = extract_answer_value(node)
+
+    return {
+        "lijst": nodes,
+        "nodes": index,
+        "kinderen": kinderen,
+        "teksten": teksten,
+        "antwoorden": antwoorden,
+    }
+
+
+def laad_boom(pad):
+    with open(pad, "r", encoding="utf-8") as f:
+        return compileer_boom(json.load(f))
+
+
+def vind_node(boom, node_id):
+    return boom["nodes"].get(str(node_id))
+
+
+def kinderen_van(boom, node):
+    return boom["kinderen"].get(str(node.get("id")), ())
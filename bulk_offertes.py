@@ -0,0 +1,281 @@
+"""
+Offertes in bulk doorrekenen (niet-interactief, naast keuzegids.py).
+
+    python bulk_offertes.py klussen.csv -o resultaten.csv
+    python bulk_offertes.py archief_2025.jsonl -o herprijsd.jsonl -p 8
+    python bulk_offertes.py klussen.csv --planning-modus optimaal
+
+Invoer (CSV met kopregel, of JSONL met één object per regel):
+    id, systeem, m2, ruimtes, extras, hellingbaan, reistijd
+extras: in CSV gescheiden door ";" (bv. "ADD250;AG lak"), in JSONL een lijst.
+
+Elke rij gaat door dezelfde prijsberekening en planning als de API
+(bereken_coating_prijs en bereken_planning uit App.py). Het werk wordt in
+blokken over een pool van processen verdeeld; elke worker laadt de data één
+keer. Invoer wordt blok voor blok gelezen en resultaten worden in volgorde
+weggeschreven, met maximaal een paar blokken tegelijk onderweg: het geheugen
+blijft vlak, ook bij een archief van honderdduizenden offertes.
+Voortgang en doorvoer (rijen/s) gaan naar stderr.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+
+UITVOER_KOLOMMEN = (
+    "id", "systeem", "m2", "ruimtes", "status",
+    "prijs_per_m2", "basisprijs", "extras_totaal", "totaalprijs",
+    "planning_dagen", "planning_manuren", "fout",
+)
+
+STANDAARD_BLOK = 500
+
+# blokken per worker die tegelijk onderweg mogen zijn
+BLOKKEN_PER_WORKER = 2
+
+_APP = None
+_PLANNING_MODUS = "standaard"
+
+
+# =========================
+# WORKER
+# =========================
+def _init_worker(planning_modus):
+    """Eén keer per proces: App (en daarmee de data) laden."""
+    global _APP, _PLANNING_MODUS
+
+    # geen watcher-thread en geen metrics-bestanden naast die van de API-workers
+    os.environ["DATA_RELOAD_INTERVAL"] = "0"
+    os.environ.pop("METRICS_DIR", None)
+
+    # opstartmeldingen van App niet tussen de uitvoer
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        import App
+    finally:
+        sys.stdout = stdout
+
+    _APP = App
+    _PLANNING_MODUS = planning_modus
+
+
+def _als_extras(waarde):
+    if waarde is None or waarde == "":
+        return []
+    if isinstance(waarde, str):
+        return [deel.strip() for deel in waarde.split(";") if deel.strip()]
+    return waarde
+
+
+def verwerk_rij(rij):
+    """Eén klus: prijs + planning, als platte dict (zie UITVOER_KOLOMMEN)."""
+    App = _APP
+
+    uit = dict.fromkeys(UITVOER_KOLOMMEN)
+    uit.update({
+        "id": rij.get("id"),
+        "systeem": rij.get("systeem"),
+        "m2": rij.get("m2"),
+        "ruimtes": rij.get("ruimtes"),
+    })
+
+    if "_fout" in rij:
+        uit["status"] = 400
+        uit["fout"] = rij["_fout"]
+        return uit
+
+    hellingbaan = rij.get("hellingbaan", rij.get("heeft_hellingbaan"))
+
+    # 1️⃣ prijs
+    payload, status = App.bereken_coating_prijs({
+        "systeem": rij.get("systeem"),
+        "oppervlakte": rij.get("m2"),
+        "ruimtes": rij.get("ruimtes") or 1,
+        "extras": _als_extras(rij.get("extras")),
+        "heeft_hellingbaan": hellingbaan,
+    })
+
+    # m2_te_klein e.d. komen als 200 met "error" terug: hier als 422
+    uit["status"] = status
+    if status != 200 or "error" in payload:
+        uit["status"] = status if status != 200 else 422
+        uit["fout"] = payload.get("message") or payload.get("error")
+        return uit
+
+    uit["prijs_per_m2"] = payload["prijs_per_m2"]
+    uit["basisprijs"] = payload["basisprijs"]
+    uit["extras_totaal"] = payload["totaalprijs"] - payload["basisprijs"]
+    uit["totaalprijs"] = payload["totaalprijs"]
+
+    # 2️⃣ planning (zelfde validatie als /api/planning)
+    try:
+        data = App.PLANNING_SCHEMA({
+            "systeem": payload["systeem"],
+            "m2": payload["oppervlakte"],
+            "reistijd": rij.get("reistijd"),
+            "ruimtes": payload["ruimtes"],
+            "heeft_hellingbaan": hellingbaan,
+        })
+
+        dagen = App.bereken_planning(
+            planning=App.huidige_snapshot()["planning"],
+            systeem_naam=data["systeem"],
+            m2=data["m2"],
+            reistijd_min=data["reistijd"],
+            ruimtes=data["ruimtes"],
+            hellingbaan=data["heeft_hellingbaan"],
+            modus=_PLANNING_MODUS,
+        )
+
+    except ValueError as e:
+        # prijs is bruikbaar, planning niet (bv. geen planningstabel voor dit systeem)
+        uit["fout"] = f"planning: {e}"
+        return uit
+
+    uit["planning_dagen"] = len(dagen)
+    uit["planning_manuren"] = round(sum(dag["totaal_incl_reistijd"] for dag in dagen), 2)
+    return uit
+
+
+def verwerk_blok(rijen):
+    resultaten = []
+
+    for rij in rijen:
+        try:
+            resultaten.append(verwerk_rij(rij))
+        except Exception as e:
+            # één kapotte rij mag de rest van het blok niet tegenhouden
+            uit = dict.fromkeys(UITVOER_KOLOMMEN)
+            uit.update({"id": rij.get("id"), "status": 500, "fout": str(e)})
+            resultaten.append(uit)
+
+    return resultaten
+
+
+# =========================
+# INVOER / UITVOER
+# =========================
+def formaat_van(pad, opgegeven):
+    if opgegeven:
+        return opgegeven
+    return "jsonl" if pad.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def lees_rijen(f, formaat):
+    if formaat == "csv":
+        yield from csv.DictReader(f)
+        return
+
+    for nummer, regel in enumerate(f, start=1):
+        regel = regel.strip()
+        if not regel:
+            continue
+        try:
+            rij = json.loads(regel)
+        except json.JSONDecodeError as e:
+            rij = {"id": f"regel {nummer}", "_fout": f"ongeldige JSON: {e}"}
+        yield rij if isinstance(rij, dict) else {"id": f"regel {nummer}", "_fout": "object verwacht"}
+
+
+def in_blokken(rijen, grootte):
+    blok = []
+    for rij in rijen:
+        blok.append(rij)
+        if len(blok) >= grootte:
+            yield blok
+            blok = []
+    if blok:
+        yield blok
+
+
+def maak_schrijver(f, formaat):
+    """Functie die een lijst resultaten als CSV of JSONL wegschrijft."""
+    if formaat == "csv":
+        schrijver = csv.DictWriter(f, fieldnames=UITVOER_KOLOMMEN, lineterminator="\n")
+        schrijver.writeheader()
+        return schrijver.writerows
+
+    def schrijf(resultaten):
+        f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in resultaten))
+
+    return schrijf
+
+
+# =========================
+# CLI
+# =========================
+def main():
+    parser = argparse.ArgumentParser(description="Offertes in bulk doorrekenen (prijs + planning)")
+    parser.add_argument("invoer", help="CSV of JSONL met klussen ('-' = stdin)")
+    parser.add_argument("-o", "--uitvoer", help="resultaatbestand (standaard stdout)")
+    parser.add_argument("--invoer-formaat", choices=("csv", "jsonl"))
+    parser.add_argument("--uitvoer-formaat", choices=("csv", "jsonl"))
+    parser.add_argument("-p", "--processen", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("-b", "--blok", type=int, default=STANDAARD_BLOK, help="rijen per blok")
+    parser.add_argument("--planning-modus", choices=("standaard", "optimaal"), default="standaard")
+    args = parser.parse_args()
+
+    if args.processen < 1 or args.blok < 1:
+        parser.error("--processen en --blok moeten minimaal 1 zijn")
+
+    invoer_formaat = formaat_van(args.invoer, args.invoer_formaat)
+    if args.uitvoer:
+        uitvoer_formaat = formaat_van(args.uitvoer, args.uitvoer_formaat)
+    else:
+        uitvoer_formaat = args.uitvoer_formaat or invoer_formaat
+
+    invoer = sys.stdin if args.invoer == "-" else open(args.invoer, "r", encoding="utf-8-sig", newline="")
+    uitvoer = open(args.uitvoer, "w", encoding="utf-8", newline="") if args.uitvoer else sys.stdout
+    schrijf = maak_schrijver(uitvoer, uitvoer_formaat)
+
+    totaal = 0
+    fouten = 0
+    start = time.perf_counter()
+    volgende_melding = start + 2
+
+    def wegschrijven(resultaten):
+        nonlocal totaal, fouten, volgende_melding
+        schrijf(resultaten)
+        totaal += len(resultaten)
+        fouten += sum(1 for r in resultaten if r["fout"])
+
+        nu = time.perf_counter()
+        if nu >= volgende_melding:
+            print(f"… {totaal} rijen, {totaal / (nu - start):.0f} rijen/s", file=sys.stderr)
+            volgende_melding = nu + 2
+
+    with multiprocessing.Pool(args.processen, initializer=_init_worker, initargs=(args.planning_modus,)) as pool:
+        onderweg = deque()
+        max_onderweg = args.processen * BLOKKEN_PER_WORKER
+
+        for blok in in_blokken(lees_rijen(invoer, invoer_formaat), args.blok):
+            onderweg.append(pool.apply_async(verwerk_blok, (blok,)))
+
+            # niet verder lezen dan de workers bijhouden
+            while len(onderweg) >= max_onderweg:
+                wegschrijven(onderweg.popleft().get())
+
+        while onderweg:
+            wegschrijven(onderweg.popleft().get())
+
+    duur = time.perf_counter() - start
+
+    if args.invoer != "-":
+        invoer.close()
+    if args.uitvoer:
+        uitvoer.close()
+
+    print(
+        f"✅ {totaal} rijen in {duur:.2f} s ({totaal / duur if duur else 0:.0f} rijen/s), "
+        f"{fouten} met fout, {args.processen} processen, blokken van {args.blok}",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+from datetime import date, timedelta
+
+# =========================
+# CAPACITEITSPLANNING (MEERDERE KLUSSEN)
+# =========================
+# Verdeelt een set klussen over ploegen en kalenderdagen. Per klus en
+# ploeggrootte komt de dagindeling uit de gewone planning (dagplanner); hier
+# wordt alleen nog gekozen welke ploeg de klus op welke werkdagen doet.
+#
+# Heuristiek: klussen op vroegste start, daarna langste eerst (LPT). Elke klus
+# gaat naar de ploeg waar hij het vroegst klaar is (gelijk: de kleinste ploeg
+# die past). Een ploeg doet één klus per dag; de dagen van een klus zijn
+# opeenvolgende werkdagen (droogtijd loopt door in het weekend).
+
+# maandag t/m vrijdag
+STANDAARD_WERKDAGEN = (0, 1, 2, 3, 4)
+
+# hoever vooruit er gezocht wordt (in werkdagen)
+STANDAARD_HORIZON = 60
+
+
+def parse_datum(waarde, veld):
+    if isinstance(waarde, date):
+        return waarde
+    try:
+        return date.fromisoformat(str(waarde))
+    except ValueError:
+        raise ValueError(f"{veld}: ongeldige datum '{waarde}' (verwacht JJJJ-MM-DD)")
+
+
+def werkdagen_vanaf(start, aantal, werkdagen=STANDAARD_WERKDAGEN):
+    """De eerste `aantal` werkdagen vanaf `start` (inclusief)."""
+    dagen = []
+    dag = start
+    while len(dagen) < aantal:
+        if dag.weekday() in werkdagen:
+            dagen.append(dag)
+        dag += timedelta(days=1)
+    return dagen
+
+
+def _vroegste_plek(bezet, kalender, vanaf_index, lengte):
+    """Index in de kalender van de eerste reeks van `lengte` vrije werkdagen."""
+    vrij_op_rij = 0
+
+    for index in range(vanaf_index, len(kalender)):
+        if kalender[index] in bezet:
+            vrij_op_rij = 0
+            continue
+
+        vrij_op_rij += 1
+        if vrij_op_rij == lengte:
+            return index - lengte + 1
+
+    return None
+
+
+def plan_capaciteit(klussen, ploegen, dagplan, start, horizon=STANDAARD_HORIZON,
+                    werkdagen=STANDAARD_WERKDAGEN):
+    """
+    klussen: [{"id", "vroegste_start" (date), ...}]
+    ploegen: [{"naam", "man", "afwezig": set(date)}]
+    dagplan(klus, max_man): dagindeling zoals bereken_planning (lijst met "man"),
+    of een ValueError als de klus niet met die ploeg kan.
+    """
+    kalender = werkdagen_vanaf(start, horizon, werkdagen)
+    index_van = {dag: i for i, dag in enumerate(kalender)}
+
+    bezet = {p["naam"]: set(p.get("afwezig", ())) for p in ploegen}
+    afwezig = {p["naam"]: set(p.get("afwezig", ())) for p in ploegen}
+
+    # dagindeling per (positie van de klus, ploeggrootte): ploegen met dezelfde
+    # grootte delen hem; niet op klus-id, dat komt van de client
+    plannen = {}
+
+    def plan_voor(positie, klus, man):
+        sleutel = (positie, man)
+        if sleutel not in plannen:
+            try:
+                plannen[sleutel] = dagplan(klus, man)
+            except ValueError as e:
+                plannen[sleutel] = e
+        return plannen[sleutel]
+
+    # LPT binnen dezelfde startdatum: lengte met de grootste ploeg als maat
+    grootste = max((p["man"] for p in ploegen), default=0)
+
+    def volgorde(positie_klus):
+        positie, klus = positie_klus
+        plan = plan_voor(positie, klus, grootste)
+        lengte = len(plan) if isinstance(plan, list) else 0
+        return (klus["vroegste_start"], -lengte, str(klus["id"]))
+
+    ingepland = []
+    niet_ingepland = []
+
+    for positie, klus in sorted(enumerate(klussen), key=volgorde):
+        vanaf = klus["vroegste_start"]
+        vanaf_index = next((i for i, dag in enumerate(kalender) if dag >= vanaf), len(kalender))
+
+        beste = None
+        redenen = []
+
+        for ploeg in ploegen:
+            plan = plan_voor(positie, klus, ploeg["man"])
+            if isinstance(plan, ValueError):
+                redenen.append(f"{ploeg['naam']}: {plan}")
+                continue
+            if not plan:
+                continue
+
+            plek = _vroegste_plek(bezet[ploeg["naam"]], kalender, vanaf_index, len(plan))
+            if plek is None:
+                redenen.append(f"{ploeg['naam']}: geen ruimte binnen {horizon} werkdagen")
+                continue
+
+            # vroegst klaar, dan de kleinste ploeg die past
+            sleutel = (plek + len(plan), ploeg["man"], ploeg["naam"])
+            if beste is None or sleutel < beste[0]:
+                beste = (sleutel, ploeg, plek, plan)
+
+        if beste is None:
+            niet_ingepland.append({"id": klus["id"], "redenen": redenen or ["geen werk"]})
+            continue
+
+        _, ploeg, plek, plan = beste
+        dagen = []
+
+        for dag_plan, datum in zip(plan, kalender[plek:plek + len(plan)]):
+            bezet[ploeg["naam"]].add(datum)
+            dagen.append(dict(dag_plan, datum=datum.isoformat()))
+
+        ingepland.append({
+            "id": klus["id"],
+            "ploeg": ploeg["naam"],
+            "start": dagen[0]["datum"],
+            "eind": dagen[-1]["datum"],
+            "dagen": dagen,
+        })
+
+    # =========================
+    # BENUTTING
+    # =========================
+    laatste = max((index_van[date.fromisoformat(k["eind"])] for k in ingepland), default=-1)
+    periode = kalender[:laatste + 1]
+
+    per_ploeg = {}
+    totaal_beschikbaar = 0
+    totaal_gebruikt = 0
+
+    for ploeg in ploegen:
+        naam = ploeg["naam"]
+        beschikbare_dagen = [d for d in periode if d not in afwezig[naam]]
+        beschikbaar = len(beschikbare_dagen) * ploeg["man"]
+
+        klusdagen = [d for k in ingepland if k["ploeg"] == naam for d in k["dagen"]]
+        gebruikt = sum(d["man"] for d in klusdagen)
+
+        per_ploeg[naam] = {
+            "man": ploeg["man"],
+            "werkdagen": len(beschikbare_dagen),
+            "bezette_dagen": len(klusdagen),
+            "beschikbare_mandagen": beschikbaar,
+            "gebruikte_mandagen": gebruikt,
+            "benutting": round(gebruikt / beschikbaar, 3) if beschikbaar else 0.0,
+        }
+
+        totaal_beschikbaar += beschikbaar
+        totaal_gebruikt += gebruikt
+
+    return {
+        "ingepland": ingepland,
+        "niet_ingepland": niet_ingepland,
+        "benutting": {
+            "van": periode[0].isoformat() if periode else None,
+            "tot": periode[-1].isoformat() if periode else None,
+            "per_ploeg": per_ploeg,
+            "beschikbare_mandagen": totaal_beschikbaar,
+            "gebruikte_mandagen": totaal_gebruikt,
+            "totaal": round(totaal_gebruikt / totaal_beschikbaar, 3) if totaal_beschikbaar else 0.0,
+        },
+    }
@@ -0,0 +1,169 @@
+import math
+
+# =========================
+# DAGPLANNER (MET BEPERKINGEN)
+# =========================
+# Verdeelt de taken van één klus over werkdagen en bepaalt per dag de ploeg.
+# Regels uit tabellen_planning.json:
+# - volgorde: een taak begint pas op de dag waarop de vorige taak af is
+#   (mag_samen_met: dan mag hij al beginnen op de startdag van de vorige)
+# - droogtijd: na een taak met volgende_dag_verplicht, of bij een hogere "dag"
+#   in de tabel, begint de volgende taak op een nieuwe dag
+# - mag_niet_samen_met: nooit op dezelfde dag
+# - onderbreekbaar: mag over meerdere dagen verdeeld worden, anders in één dag
+# - per persoon hoogstens max_werk_per_persoon uur werk (werkdag min reistijd)
+# - optioneel: nooit meer dan max_man mensen op een dag
+#
+# Voor elke ploeggrootte wordt greedy ingepland en daarna per dag de ploeg
+# verkleind tot wat de uren vragen; de beste uitkomst wint
+# (doel "dagen": minste dagen, doel "mandagen": minste mandagen).
+
+DOELEN = ("dagen", "mandagen")
+
+EPS = 1e-9
+
+
+def _conflict(taak, dag):
+    for andere in dag["taken"]:
+        if andere["naam"] in taak["niet_samen_met"] or taak["naam"] in andere["niet_samen_met"]:
+            return True
+    return False
+
+
+def _samen(eerder, taak):
+    return eerder["naam"] in taak["samen_met"] or taak["naam"] in eerder["samen_met"]
+
+
+def _vroegste_dag(taak, geplaatst):
+    vroegst = 0
+
+    for eerder, start, eind in geplaatst:
+        if eerder["volgende_dag_verplicht"] or eerder["dag"] < taak["dag"]:
+            vroegst = max(vroegst, eind + 1)
+        elif _samen(eerder, taak):
+            vroegst = max(vroegst, start)
+        else:
+            vroegst = max(vroegst, eind)
+
+    return vroegst
+
+
+def _nieuwe_dag(ploeg):
+    return {"man": ploeg, "uren": 0.0, "taken": [], "delen": []}
+
+
+def _plan_met_ploeg(taken, ploeg, max_werk, max_man=None):
+    dagen = []
+    geplaatst = []
+
+    def dag_op(index):
+        while len(dagen) <= index:
+            dagen.append(_nieuwe_dag(ploeg))
+        return dagen[index]
+
+    for taak in taken:
+        index = _vroegste_dag(taak, geplaatst)
+        rest = taak["uren"]
+        start = None
+
+        while True:
+            dag = dag_op(index)
+
+            if _conflict(taak, dag):
+                index += 1
+                continue
+
+            man = max(dag["man"], taak["min_man"])
+            ruimte = man * max_werk - dag["uren"]
+
+            if not taak["onderbreekbaar"]:
+                if rest > ruimte + EPS:
+                    if rest <= ploeg * max_werk + EPS or dag["taken"]:
+                        # past op een lege dag met de gewone ploeg: doorschuiven
+                        index += 1
+                        continue
+                    # past nooit met deze ploeg: de ploeg voor deze dag vergroten
+                    man = max(man, math.ceil((dag["uren"] + rest) / max_werk - EPS))
+
+                    if max_man is not None and man > max_man:
+                        raise ValueError(
+                            f"{taak['naam']} ({taak['uren']} uur) past niet in één dag met {max_man} man"
+                        )
+
+                deel = rest
+            else:
+                if ruimte <= EPS:
+                    index += 1
+                    continue
+                deel = min(rest, ruimte)
+
+            dag["man"] = man
+            dag["uren"] += deel
+            dag["taken"].append(taak)
+            dag["delen"].append((taak, deel))
+
+            if start is None:
+                start = index
+
+            rest -= deel
+            if rest <= EPS:
+                break
+            index += 1
+
+        geplaatst.append((taak, start, index))
+
+    # achteraf per dag niet meer mensen dan de ingeplande uren nodig hebben
+    for dag in dagen:
+        dag["man"] = max(
+            max(t["min_man"] for t in dag["taken"]),
+            math.ceil(dag["uren"] / max_werk - EPS)
+        )
+
+    return dagen
+
+
+def _score(dagen, doel):
+    aantal = len(dagen)
+    mandagen = sum(d["man"] for d in dagen)
+    return (aantal, mandagen) if doel == "dagen" else (mandagen, aantal)
+
+
+def plan_dagen(taken, max_werk, doel="dagen", max_man=None):
+    """
+    Taken (in volgorde) → lijst dagen {"man", "uren", "delen": [(taak, uren)]}.
+
+    Een taak: {"naam", "uren", "min_man", "dag", "onderbreekbaar",
+    "volgende_dag_verplicht", "samen_met", "niet_samen_met", ...}.
+    Met max_man wordt de ploeg nooit groter dan het aantal beschikbare mensen.
+    """
+    if doel not in DOELEN:
+        raise ValueError(f"Onbekend planningsdoel: {doel}")
+
+    taken = [t for t in taken if t["uren"] > EPS]
+    if not taken:
+        return []
+
+    # min_man per taak wordt per dag afgedwongen; de basisploeg mag kleiner zijn.
+    # Een grotere ploeg dan alle uren in één dag levert nooit iets op.
+    max_ploeg = max(
+        max(t["min_man"] for t in taken),
+        math.ceil(sum(t["uren"] for t in taken) / max_werk - EPS)
+    )
+
+    if max_man is not None:
+        te_groot = [t["naam"] for t in taken if t["min_man"] > max_man]
+        if te_groot:
+            raise ValueError(f"{', '.join(te_groot)} vraagt meer dan {max_man} man")
+        max_ploeg = min(max_ploeg, max_man)
+
+    beste = None
+    beste_score = None
+
+    for ploeg in range(1, max_ploeg + 1):
+        dagen = _plan_met_ploeg(taken, ploeg, max_werk, max_man)
+        score = _score(dagen, doel)
+
+        if beste is None or score < beste_score:
+            beste, beste_score = dagen, score
+
+    return beste
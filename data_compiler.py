@@ -0,0 +1,258 @@
+"""
+Data compiler voor de keuzegids-backend.
+
+Controleert keuzeboom.json, de prijstabellen en tabellen_planning.json en
+schrijft daarna een gecompileerde snapshot (data_snapshot.pickle) die App.py
+bij het opstarten direct laadt. Ontbreekt de snapshot of hoort hij bij
+andere JSON, dan laadt App.py gewoon de JSON.
+
+    python data_compiler.py                 # controleren + snapshot schrijven
+    python data_compiler.py --controleer    # alleen controleren
+    python data_compiler.py --streng        # waarschuwingen tellen als fout
+
+Exitcode 1 bij fouten (met --streng ook bij waarschuwingen); dan wordt er
+geen snapshot geschreven.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import data_snapshot
+from boom_index import extract_system_name
+from planning_index import compileer_planning
+from staffels import compileer_prijstabellen
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 'next'-waarden die het einde van een pad markeren (geen node)
+EIND_MARKERS = {"END"}
+
+
+# =========================
+# KEUZEBOOM
+# =========================
+def _verwijzingen(node):
+    """Ids in 'next' (inline dicts tellen niet als verwijzing)."""
+    return [str(c) for c in node.get("next", []) if not isinstance(c, dict)]
+
+
+def _zoek_cycli(nodes):
+    """Iteratieve DFS; geeft per gevonden cyclus het pad terug."""
+    WIT, GRIJS, ZWART = 0, 1, 2
+    kleur = dict.fromkeys(nodes, WIT)
+    cycli = []
+
+    for begin in nodes:
+        if kleur[begin] != WIT:
+            continue
+
+        pad = [begin]
+        stapel = [iter(_verwijzingen(nodes[begin]))]
+        kleur[begin] = GRIJS
+
+        while stapel:
+            volgende = next(stapel[-1], None)
+
+            if volgende is None:
+                kleur[pad.pop()] = ZWART
+                stapel.pop()
+                continue
+
+            if volgende not in nodes:
+                continue
+
+            if kleur[volgende] == GRIJS:
+                cycli.append(pad[pad.index(volgende):] + [volgende])
+            elif kleur[volgende] == WIT:
+                kleur[volgende] = GRIJS
+                pad.append(volgende)
+                stapel.append(iter(_verwijzingen(nodes[volgende])))
+
+    return cycli
+
+
+def controleer_boom(lijst, prijs_data, fouten, waarschuwingen):
+    nodes = {}
+
+    for node in lijst:
+        node_id = str(node.get("id"))
+        if node_id in nodes:
+            fouten.append(f"keuzeboom: dubbele node-id '{node_id}'")
+            continue
+        nodes[node_id] = node
+
+    # 1️⃣ verwijzingen naar niet-bestaande nodes
+    for node_id, node in nodes.items():
+        for child in _verwijzingen(node):
+            if child not in nodes and child not in EIND_MARKERS:
+                fouten.append(f"keuzeboom: '{node_id}' verwijst naar onbekende node '{child}'")
+
+    # 2️⃣ cycli
+    for cyclus in _zoek_cycli(nodes):
+        fouten.append(f"keuzeboom: cyclus {' → '.join(cyclus)}")
+
+    # 3️⃣ onbereikbare nodes
+    start = data_snapshot.START_NODE
+    if start not in nodes:
+        fouten.append(f"keuzeboom: start-node '{start}' ontbreekt")
+    else:
+        bereikt = set()
+        stapel = [start]
+
+        while stapel:
+            node_id = stapel.pop()
+            if node_id in bereikt or node_id not in nodes:
+                continue
+            bereikt.add(node_id)
+            stapel.extend(_verwijzingen(nodes[node_id]))
+
+        onbereikbaar = sorted(set(nodes) - bereikt)
+        if onbereikbaar:
+            waarschuwingen.append(
+                f"keuzeboom: {len(onbereikbaar)} node(s) niet bereikbaar vanaf {start}: {', '.join(onbereikbaar)}"
+            )
+
+    # 4️⃣ systemen zonder prijstabel
+    prijs_systemen = prijs_data.get("systemen", {})
+    per_kleine_letters = {naam.lower(): naam for naam in prijs_systemen}
+    zonder_prijs = {}
+
+    for node_id, node in nodes.items():
+        if node.get("type") != "systeem":
+            continue
+
+        naam = extract_system_name(node)
+        if naam not in prijs_systemen:
+            zonder_prijs.setdefault(naam, []).append(node_id)
+
+    for naam, ids in sorted(zonder_prijs.items()):
+        hint = ""
+        if naam.lower() in per_kleine_letters:
+            hint = f" (hoofdletters wijken af van '{per_kleine_letters[naam.lower()]}')"
+        waarschuwingen.append(
+            f"keuzeboom: systeem '{naam}' heeft geen prijstabel{hint}; nodes {', '.join(ids)}"
+        )
+
+    # 5️⃣ extras die niet in de prijstabellen staan
+    bekende_extras = {e.strip().lower() for e in prijs_data.get("extras", {})}
+    bekende_extras |= {e.strip().lower() for e in prijs_data.get("extra_systemen", {})}
+
+    for node_id, node in nodes.items():
+        extras = []
+        if node.get("chosen_extra"):
+            extras.append(node["chosen_extra"])
+
+        forced = node.get("forced_extras") or []
+        extras += forced if isinstance(forced, list) else [forced]
+
+        for extra in extras:
+            if str(extra).strip().lower() not in bekende_extras:
+                waarschuwingen.append(f"keuzeboom: '{node_id}' gebruikt onbekende extra '{extra}'")
+
+
+# =========================
+# PRIJSTABELLEN
+# =========================
+def controleer_staffels(tabellen, soort, fouten):
+    for naam, tabel in tabellen.items():
+        try:
+            compileer_prijstabellen({naam: tabel}, soort)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            # de melding bevat de naam van het systeem al
+            fouten.append(str(e))
+
+
+# =========================
+# PLANNING
+# =========================
+def controleer_planning(planning_data, prijs_data, fouten, waarschuwingen):
+    eigenaar = {}
+
+    for systeem in planning_data.get("systemen", []):
+        for naam in [systeem["naam"]] + list(systeem.get("aliases", [])):
+            sleutel = naam.lower()
+            if sleutel in eigenaar and eigenaar[sleutel] != systeem["naam"]:
+                fouten.append(
+                    f"planning: '{naam}' hoort bij zowel '{eigenaar[sleutel]}' als '{systeem['naam']}'"
+                )
+            eigenaar.setdefault(sleutel, systeem["naam"])
+
+    try:
+        planning = compileer_planning(planning_data)
+    except (ValueError, KeyError, TypeError) as e:
+        fouten.append(f"planning: {e}")
+        return
+
+    prijs_systemen = {naam.lower() for naam in prijs_data.get("systemen", {})}
+
+    for naam in sorted(prijs_data.get("systemen", {})):
+        if naam.lower() not in planning["systemen"]:
+            waarschuwingen.append(f"planning: prijssysteem '{naam}' heeft geen planning (naam of alias)")
+
+    for sleutel in sorted(planning["systemen"]):
+        if sleutel not in prijs_systemen:
+            waarschuwingen.append(f"planning: '{sleutel}' verwijst naar geen enkel prijssysteem")
+
+
+# =========================
+# ALLES
+# =========================
+def controleer(ruw):
+    """Geeft (fouten, waarschuwingen) terug, elk een lijst met meldingen."""
+    fouten = []
+    waarschuwingen = []
+
+    prijs_data = ruw["prijs_data"]
+
+    controleer_boom(ruw["keuzeboom"], prijs_data, fouten, waarschuwingen)
+    controleer_staffels(prijs_data.get("systemen", {}), "prijssysteem", fouten)
+    controleer_staffels(prijs_data.get("extra_systemen", {}), "extra systeem", fouten)
+    controleer_staffels(ruw["polijst_data"].get("systemen", {}), "polijstsysteem", fouten)
+    controleer_planning(ruw["planning_data"], prijs_data, fouten, waarschuwingen)
+
+    return fouten, waarschuwingen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Controleert en compileert de keuzegids-data")
+    parser.add_argument("--map", default=BASE_DIR, help="map met de JSON-bestanden")
+    parser.add_argument("--controleer", action="store_true", help="alleen controleren, niets schrijven")
+    parser.add_argument("--streng", action="store_true", help="waarschuwingen tellen als fout")
+    args = parser.parse_args()
+
+    inhoud, versie = data_snapshot.lees_bestanden(args.map)
+
+    try:
+        ruw = {sleutel: json.loads(bytes_.decode("utf-8")) for sleutel, bytes_ in inhoud.items()}
+    except ValueError as e:
+        print("❌ ongeldige JSON:", e)
+        return 1
+
+    fouten, waarschuwingen = controleer(ruw)
+
+    for melding in waarschuwingen:
+        print("⚠️ ", melding)
+    for melding in fouten:
+        print("❌", melding)
+
+    print(f"\n{len(fouten)} fout(en), {len(waarschuwingen)} waarschuwing(en)")
+
+    if fouten or (args.streng and waarschuwingen):
+        return 1
+
+    if args.controleer:
+        return 0
+
+    start = time.perf_counter()
+    data = data_snapshot.compileer_data(ruw)
+    pad = data_snapshot.schrijf_gecompileerd(args.map, versie, data)
+
+    print(f"✅ {pad} geschreven (versie {versie[:12]}, {os.path.getsize(pad) // 1024} KB, "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
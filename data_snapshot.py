@@ -0,0 +1,266 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from types import MappingProxyType
+
+from boom_index import compileer_boom
+from staffels import compileer_prijstabellen
+from planning_index import compileer_planning
+from bereikbaarheid import compileer_bereikbaarheid
+from systeem_paden import compileer_systeem_paden
+from zoekindex import compileer_zoekindex
+
+# =========================
+# DATA SNAPSHOT (HOT RELOAD)
+# =========================
+# Alle JSON-bestanden + alles wat daaruit gecompileerd wordt zitten in één
+# snapshot. Een nieuwe snapshot wordt volledig opgebouwd en gevalideerd
+# voordat hij in één toewijzing de oude vervangt; lopende requests houden
+# hun eigen snapshot vast. Een kapot bestand vervangt nooit een goede snapshot.
+
+DATA_BESTANDEN = {
+    "keuzeboom": "keuzeboom.json",
+    "prijs_data": "Prijstabellen coatingsystemen.json",
+    "polijst_data": "Prijstabellen polijsten.json",
+    "planning_data": "tabellen_planning.json",
+}
+
+START_NODE = "BFC"
+
+_HUIDIG = None
+_LOCK = threading.Lock()
+
+
+def bestand_signatuur(base_dir):
+    """(mtime, grootte) per bestand: goedkoop om te controleren of er iets veranderd is."""
+    signatuur = []
+    for bestand in DATA_BESTANDEN.values():
+        st = os.stat(os.path.join(base_dir, bestand))
+        signatuur.append((bestand, st.st_mtime_ns, st.st_size))
+    return tuple(signatuur)
+
+
+def lees_bestanden(base_dir):
+    """Ruwe bytes per bestand + sha256 over alles (de dataversie)."""
+    inhoud = {}
+    hasher = hashlib.sha256()
+
+    for sleutel, bestand in DATA_BESTANDEN.items():
+        with open(os.path.join(base_dir, bestand), "rb") as f:
+            inhoud[sleutel] = f.read()
+
+        hasher.update(bestand.encode("utf-8"))
+        hasher.update(inhoud[sleutel])
+
+    return inhoud, hasher.hexdigest()
+
+
+def compileer_data(ruw):
+    """Alles wat uit de JSON-data afgeleid wordt; gooit een exception bij ongeldige data."""
+    boom = compileer_boom(ruw["keuzeboom"])
+    if START_NODE not in boom["nodes"]:
+        raise ValueError(f"start-node '{START_NODE}' ontbreekt in keuzeboom")
+
+    prijs_data = ruw["prijs_data"]
+    polijst_data = ruw["polijst_data"]
+    bereikbaar = compileer_bereikbaarheid(boom)
+    planning = compileer_planning(ruw["planning_data"])
+
+    return {
+        "keuzeboom": ruw["keuzeboom"],
+        "prijs_data": prijs_data,
+        "polijst_data": polijst_data,
+        "planning_data": ruw["planning_data"],
+
+        # keuzeboom: id → node, kinderen, teksten
+        "boom": boom,
+
+        # per node: bereikbare systemen/afwijkingen (bitsets), resterende vragen
+        "bereikbaar": bereikbaar,
+
+        # systeemnaam (of planning-alias) → prefix-trie van alle antwoordpaden
+        "systeem_paden": compileer_systeem_paden(boom, bereikbaar, planning, START_NODE),
+
+        # tekst-zoeken: token → bitset van nodes
+        "zoekindex": compileer_zoekindex(boom),
+
+        # staffels vooraf compileren (fout in prijstabel = snapshot wordt geweigerd)
+        "prijs_staffels": compileer_prijstabellen(prijs_data.get("systemen", {}), "prijssysteem"),
+        "extra_staffels": compileer_prijstabellen(prijs_data.get("extra_systemen", {}), "extra systeem"),
+        "polijst_staffels": compileer_prijstabellen(polijst_data.get("systemen", {}), "polijstsysteem"),
+
+        # extra_systemen hoofdletter-ongevoelig opzoeken
+        "extra_systemen_sleutels": {
+            key.strip().lower(): key
+            for key in prijs_data.get("extra_systemen", {}).keys()
+        },
+
+        # planning: naam/alias → systeem (planning_ref gevolgd), max_m2 per bewerking
+        "planning": planning,
+    }
+
+
+# =========================
+# GECOMPILEERDE SNAPSHOT (data_compiler.py)
+# =========================
+# data_compiler.py valideert de JSON en schrijft het resultaat van
+# compileer_data als pickle. Alleen gebruiken als de dataversie exact
+# overeenkomt; anders (of bij een ontbrekend/kapot bestand) gewoon de JSON.
+# Ook de broncode van de compileerstap telt mee: na een code-update wordt een
+# oude pickle dus niet meer gebruikt. Het bestand komt uit de eigen
+# deploy-stap en wordt vertrouwd.
+
+SNAPSHOT_BESTAND = "data_snapshot.pickle"
+SNAPSHOT_FORMAAT = 1
+
+CODE_MODULES = ("data_snapshot.py", "boom_index.py", "staffels.py", "planning_index.py",
+                "bereikbaarheid.py", "systeem_paden.py", "zoekindex.py")
+
+
+def code_versie():
+    hasher = hashlib.sha256()
+    code_dir = os.path.dirname(os.path.abspath(__file__))
+
+    for bestand in CODE_MODULES:
+        with open(os.path.join(code_dir, bestand), "rb") as f:
+            hasher.update(f.read())
+
+    return hasher.hexdigest()
+
+
+def lees_gecompileerd(base_dir, versie):
+    pad = os.path.join(base_dir, SNAPSHOT_BESTAND)
+    if not os.path.exists(pad):
+        return None
+
+    try:
+        with open(pad, "rb") as f:
+            opgeslagen = pickle.load(f)
+    except Exception as e:
+        print("❌ gecompileerde data onleesbaar, JSON wordt gebruikt:", e)
+        return None
+
+    if not isinstance(opgeslagen, dict) or opgeslagen.get("formaat") != SNAPSHOT_FORMAAT:
+        print("❌ gecompileerde data heeft een ander formaat, JSON wordt gebruikt")
+        return None
+
+    if opgeslagen.get("versie") != versie or opgeslagen.get("code_versie") != code_versie():
+        # JSON of code is na het compileren aangepast (of hot reload): JSON wint
+        return None
+
+    return opgeslagen["data"]
+
+
+def schrijf_gecompileerd(base_dir, versie, data):
+    pad = os.path.join(base_dir, SNAPSHOT_BESTAND)
+    tijdelijk = pad + ".tmp"
+
+    with open(tijdelijk, "wb") as f:
+        pickle.dump(
+            {"formaat": SNAPSHOT_FORMAAT, "versie": versie, "code_versie": code_versie(), "data": data},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+    os.replace(tijdelijk, pad)
+    return pad
+
+
+def bouw_snapshot(base_dir):
+    """Leest en compileert alle data; gooit een exception bij ongeldige data."""
+    signatuur = bestand_signatuur(base_dir)
+    inhoud, versie = lees_bestanden(base_dir)
+
+    data = lees_gecompileerd(base_dir, versie)
+    bron = "gecompileerd"
+
+    if data is None:
+        data = compileer_data({
+            sleutel: json.loads(bytes_.decode("utf-8"))
+            for sleutel, bytes_ in inhoud.items()
+        })
+        bron = "json"
+
+    return MappingProxyType({
+        "versie": versie,
+        "signatuur": signatuur,
+        "geladen_op": time.time(),
+        "bron": bron,
+
+        **data,
+
+        # (node_id, depth) → expanded node; hoort bij deze snapshot
+        "expand_cache": {},
+
+        # ETag → geserialiseerde JSON-bytes van boomresponses
+        "json_cache": {},
+    })
+
+
+def laad(base_dir):
+    global _HUIDIG
+    snapshot = bouw_snapshot(base_dir)
+    with _LOCK:
+        _HUIDIG = snapshot
+    return snapshot
+
+
+def actueel():
+    return _HUIDIG
+
+
+def herlaad_als_gewijzigd(base_dir):
+    """
+    Bouwt een nieuwe snapshot als de bestanden veranderd zijn.
+    Geeft True terug als er gewisseld is.
+    """
+    global _HUIDIG
+
+    huidig = _HUIDIG
+    if huidig is not None and bestand_signatuur(base_dir) == huidig["signatuur"]:
+        return False
+
+    nieuw = bouw_snapshot(base_dir)
+
+    with _LOCK:
+        # alleen wisselen als de inhoud echt anders is (touch zonder wijziging)
+        if _HUIDIG is not None and _HUIDIG["versie"] == nieuw["versie"]:
+            _HUIDIG = MappingProxyType({**_HUIDIG, "signatuur": nieuw["signatuur"]})
+            return False
+
+        _HUIDIG = nieuw
+
+    return True
+
+
+def start_watcher(base_dir, interval):
+    """Controleert elke `interval` seconden de bestanden in een achtergrondthread."""
+
+    def loop():
+        mislukte_signatuur = None
+
+        while True:
+            time.sleep(interval)
+            signatuur = None
+
+            try:
+                signatuur = bestand_signatuur(base_dir)
+                if signatuur == mislukte_signatuur:
+                    continue
+
+                if herlaad_als_gewijzigd(base_dir):
+                    print("✅ data opnieuw geladen:", _HUIDIG["versie"][:12])
+
+                mislukte_signatuur = None
+
+            except Exception as e:
+                # oude snapshot blijft staan; pas opnieuw proberen na een nieuwe wijziging
+                print("❌ data herladen mislukt, oude data blijft actief:", e)
+                mislukte_signatuur = signatuur
+
+    thread = threading.Thread(target=loop, name="data-watcher", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,142 @@
+"""
+Geheugen per worker meten (Linux, /proc/<pid>/smaps_rollup).
+
+Bootst gunicorn na met os.fork: een master die de app wel of niet vooraf
+laadt (preload), met of zonder gc.freeze(), en N workers die een request-mix
+draaien. Per scenario: gemiddelde RSS, PSS en USS (privé-geheugen) per worker.
+
+    python geheugen_meting.py                    # alle scenario's, 4 workers
+    python geheugen_meting.py -w 8 -n 2000
+
+USS is wat er per extra worker echt bijkomt.
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+
+SCENARIOS = ("los", "preload", "preload_freeze")
+
+
+def geheugen_kb():
+    """RSS, PSS en USS (Private_Clean + Private_Dirty) in KB."""
+    waarden = {}
+    with open("/proc/self/smaps_rollup", encoding="ascii") as f:
+        for regel in f:
+            delen = regel.split()
+            if len(delen) >= 3 and delen[2] == "kB":
+                waarden[delen[0].rstrip(":")] = int(delen[1])
+
+    return {
+        "rss_kb": waarden.get("Rss", 0),
+        "pss_kb": waarden.get("Pss", 0),
+        "uss_kb": waarden.get("Private_Clean", 0) + waarden.get("Private_Dirty", 0),
+    }
+
+
+def draai_mix(aantal):
+    import benchmark
+
+    mix = benchmark.bouw_mix(42, aantal)
+    for naam, functie in benchmark.benchmarks(mix).items():
+        if naam.endswith("_all") or "koud" in naam or "batch" in naam:
+            continue
+        for i in range(aantal):
+            functie(i)
+
+
+def worker(aantal, preload, klaar_w, meet_r, resultaat_w):
+    if not preload:
+        import App  # noqa: F401
+
+    gc.enable()
+    draai_mix(aantal)
+
+    # wachten tot alle workers klaar zijn, zodat PSS over dezelfde set gaat
+    os.write(klaar_w, b"1")
+    os.read(meet_r, 1)
+
+    os.write(resultaat_w, json.dumps(geheugen_kb()).encode() + b"\n")
+    os._exit(0)
+
+
+def scenario(naam, workers, aantal):
+    os.environ["DATA_RELOAD_INTERVAL"] = "0"
+    preload = naam != "los"
+
+    if naam == "preload_freeze":
+        gc.disable()
+
+    if preload:
+        import benchmark  # noqa: F401  (laadt App)
+
+    if naam == "preload_freeze":
+        gc.freeze()
+
+    master = geheugen_kb()
+    klaar_r, klaar_w = os.pipe()
+    resultaat_r, resultaat_w = os.pipe()
+    meet_pipes = []
+    pids = []
+
+    for _ in range(workers):
+        meet_r, meet_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            worker(aantal, preload, klaar_w, meet_r, resultaat_w)
+        pids.append(pid)
+        meet_pipes.append(meet_w)
+
+    for _ in range(workers):
+        os.read(klaar_r, 1)
+    for meet_w in meet_pipes:
+        os.write(meet_w, b"1")
+
+    regels = b""
+    with os.fdopen(resultaat_r, "rb") as f:
+        os.close(resultaat_w)
+        while regels.count(b"\n") < workers:
+            blok = f.read1(65536)
+            if not blok:
+                break
+            regels += blok
+
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    metingen = [json.loads(r) for r in regels.splitlines()]
+    gemiddeld = {k: round(sum(m[k] for m in metingen) / len(metingen)) for k in metingen[0]}
+
+    return {"scenario": naam, "workers": workers, "master": master, "per_worker": gemiddeld}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geheugen per worker meten")
+    parser.add_argument("-w", "--workers", type=int, default=4)
+    parser.add_argument("-n", "--aantal", type=int, default=500, help="operaties per benchmark per worker")
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(scenario(args.scenario, args.workers, args.aantal)))
+        return
+
+    # elk scenario in een schoon proces
+    print(f"{'scenario':16} {'RSS/worker':>12} {'PSS/worker':>12} {'USS/worker':>12} {'master RSS':>12}")
+
+    for naam in SCENARIOS:
+        uitvoer = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--scenario", naam,
+             "-w", str(args.workers), "-n", str(args.aantal)],
+            check=True, capture_output=True, text=True
+        ).stdout
+
+        r = json.loads(uitvoer.strip().splitlines()[-1])
+        w = r["per_worker"]
+        print(f"{naam:16} {w['rss_kb']:>9} KB {w['pss_kb']:>9} KB {w['uss_kb']:>9} KB {r['master']['rss_kb']:>9} KB")
+
+
+if __name__ == "__main__":
+    main()
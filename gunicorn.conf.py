@@ -0,0 +1,53 @@
+# =========================
+# GUNICORN (PRELOAD + GEDEELD GEHEUGEN)
+# =========================
+# Start: gunicorn App:app   (dit bestand wordt automatisch gelezen)
+#
+# De master laadt en compileert de data één keer (preload_app). Daarna gaan
+# alle objecten met gc.freeze() naar de permanente generatie: de garbage
+# collector in de workers raakt ze dan niet meer aan, zodat de geheugenpagina's
+# na de fork gedeeld blijven (copy-on-write). Meten: python geheugen_meting.py
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+preload_app = True
+
+# de watcher-thread overleeft een fork niet: pas per worker starten
+DATA_RELOAD_INTERVAL = float(os.environ.get("DATA_RELOAD_INTERVAL", 5))
+os.environ["DATA_RELOAD_INTERVAL"] = "0"
+
+# tijdens het laden geen collecties: vrijgekomen gaten in pagina's worden
+# anders later in de workers opgevuld (en dus alsnog gekopieerd)
+gc.disable()
+
+
+def on_starting(server):
+    # METRICS_DIR: elke start van de master begint met lege tellers (zie metrics.py)
+    import metrics
+    metrics.leeg_map()
+
+
+def when_ready(server):
+    # app is geladen (preload): alles wat nu leeft bevriezen vóór de eerste fork
+    gc.freeze()
+    server.log.info("gc.freeze(): %d objecten bevroren", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    import App
+    import data_snapshot
+    import metrics
+
+    gc.enable()
+    metrics.reset_na_fork()
+
+    if DATA_RELOAD_INTERVAL > 0:
+        data_snapshot.start_watcher(App.BASE_DIR, DATA_RELOAD_INTERVAL)
+
+
+def child_exit(server, worker):
+    # stand van de gestopte worker naar het archief in METRICS_DIR
+    import metrics
+    metrics.archiveer_worker(worker.pid)
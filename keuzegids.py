@@ -1,5 +1,7 @@
 import json
-import re
+
+from boom_index import compileer_boom, vind_node, clean_answer
+from staffels import compileer_staffel, zoek_staffel
 
 # -------------------------------------------------------
 # BESTANDEN LADEN
@@ -10,45 +12,42 @@ PRIJSBESTAND = "Prijstabellen coatingsystemen.json"
 with open(KEUZEBESTAND, "r", encoding="utf-8") as f:
     boom = json.load(f)
 
+boom_index = compileer_boom(boom)
+
 with open(PRIJSBESTAND, "r", encoding="utf-8") as f:
     pdata = json.load(f)
 
 prijzen = pdata.get("Blad1", pdata)
 
+staffels_per_systeem = {
+    naam: compileer_staffel(sd["staffel"], naam)
+    for naam, sd in prijzen.items()
+    if isinstance(sd, dict) and "staffel" in sd
+}
+
 # -------------------------------------------------------
 # HELPERS
 # -------------------------------------------------------
-def clean_answer(txt):
-    """Verwijder 'Antw:' of 'Sys:' of 'Xtr:'."""
-    return re.sub(r"^(Antw:|Sys:|Xtr:)\s*", "", txt).strip()
-
 def find_node(node_id):
     """Vind node in keuzeboom."""
     if node_id == "END":
         return {"id": "END", "type": "end", "text": "Einde", "next": []}
-    return next((n for n in boom if n["id"] == node_id), None)
+    return vind_node(boom_index, node_id)
 
-def staffel_index(staffels, opp):
-    """Correcte staffel bepalen."""
+def staffel_index(gecompileerd, opp):
+    """Correcte staffel bepalen (gecompileerde staffel)."""
     if opp < 30:
         return 0
-    for i, s in enumerate(staffels):
-        clean = s.replace("+", "")
-        parts = clean.split("-")
-        try:
-            low = float(parts[0])
-            high = float(parts[1]) if len(parts) > 1 else 999999
-        except:
-            continue
-        if low <= opp <= high:
-            return i
-    return len(staffels) - 1
+    idx = zoek_staffel(gecompileerd, opp)
+    if idx is None:
+        return len(gecompileerd[1]) - 1
+    return idx
 
 def bereken_prijs(system, opp, ruimtes):
     sd = prijzen[system]
     staffels = sd["staffel"]
     prijzen_m2 = sd["prijzen"][str(ruimtes)]
-    idx = staffel_index(staffels, opp)
+    idx = staffel_index(staffels_per_systeem[system], opp)
     pm2 = prijzen_m2[idx]
     totaal = pm2 * opp
 
@@ -87,7 +86,7 @@ def main():
         # ---------------------------------------------------
         if t == "vraag":
             print("\n" + node["text"])
-            keuzes = [clean_answer(find_node(k)["text"]) for k in node["next"]]
+            keuzes = [boom_index["teksten"][k] for k in node["next"]]
 
             for i, k in enumerate(keuzes, 1):
                 print(f"{i}.   {k}")
@@ -208,8 +207,7 @@ def main():
 
             systemen = []
             for sid in opties:
-                n = find_node(sid)
-                sys = clean_answer(n["text"])
+                sys = boom_index["teksten"][sid]
                 pr = bereken_prijs(sys, opp, ruimtes)
                 systemen.append((sid, sys, pr))
 
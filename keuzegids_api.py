@@ -1,6 +1,9 @@
 from flask import Flask, request, jsonify
 import json
 
+from boom_index import compileer_boom, vind_node, extract_system_name
+from staffels import compileer_staffel, zoek_staffel
+
 app = Flask(__name__)
 
 # ============================================================
@@ -19,23 +22,21 @@ with open(PRIJSBESTAND, "r", encoding="utf-8") as f:
 
 prijzen_data = _raw.get("Blad1", _raw)  # fallback voor Excel-export
 
+staffels_per_systeem = {
+    naam: compileer_staffel(sd["staffel"], naam)
+    for naam, sd in prijzen_data.items()
+    if isinstance(sd, dict) and "staffel" in sd
+}
+
 
 # ============================================================
 # PRIJSBEREKENING (ongewijzigd)
 # ============================================================
-def bepaal_staffel_index(staffels, oppervlakte):
-    for i, s in enumerate(staffels):
-        parts = s.replace("+", "").split("-")
-        try:
-            onder = float(parts[0])
-            boven = float(parts[1]) if len(parts) > 1 else 999999
-        except ValueError:
-            continue
-
-        if onder <= oppervlakte <= boven:
-            return i
-
-    return len(staffels) - 1
+def bepaal_staffel_index(gecompileerd, oppervlakte):
+    index = zoek_staffel(gecompileerd, oppervlakte)
+    if index is None:
+        return len(gecompileerd[1]) - 1
+    return index
 
 
 def bereken(sys, oppervlakte, ruimtes, belasting=3):
@@ -58,7 +59,7 @@ def bereken(sys, oppervlakte, ruimtes, belasting=3):
             "error": f"Ongeldige structuur voor systeem '{sys}'"
         }
 
-    index = bepaal_staffel_index(staffels, oppervlakte)
+    index = bepaal_staffel_index(staffels_per_systeem[sys], oppervlakte)
     prijs_m2 = prijzenlijst[index]
 
     toeslag = SCHRAPLAAG_TOESLAG if "schraplaag" in sys.lower() else 0
@@ -85,32 +86,12 @@ def bereken(sys, oppervlakte, ruimtes, belasting=3):
 with open(KEUZEBESTAND, "r", encoding="utf-8") as f:
     keuzeboom = json.load(f)
 
+boom_index = compileer_boom(keuzeboom)
 
-def find_node(node_id):
-    """Zoekt een node op id in de keuzeboom-lijst."""
-    return next((n for n in keuzeboom if str(n.get("id")) == str(node_id)), None)
 
-
-def extract_answer_value(node):
-    """Converteert antwoordtekst:
-       'Antw: nee' → 'nee'
-       'J/N: ja'  → 'ja'
-       'A/B: droog' → 'droog'
-    """
-    txt = node.get("text", "").strip()
-    if ":" in txt:
-        return txt.split(":", 1)[1].strip()
-    return txt
-
-
-def extract_system_name(node):
-    """Haalt systeemnaam uit:
-       'Sys: DOS Basic' → 'DOS Basic'
-    """
-    raw = node.get("text", "").strip()
-    if ":" in raw:
-        return raw.split(":", 1)[1].strip()
-    return raw
+def find_node(node_id):
+    """Zoekt een node op id in de keuzeboom-index."""
+    return vind_node(boom_index, node_id)
 
 
 # ============================================================
@@ -145,7 +126,7 @@ def api_get_node():
         for nxt in next_ids:
             ans_node = find_node(nxt)
             if ans_node and ans_node.get("type") == "antwoord":
-                keuzes.append(extract_answer_value(ans_node))
+                keuzes.append(boom_index["antwoorden"][str(nxt)])
             else:
                 keuzes.append("Onbekend")
 
@@ -162,7 +143,7 @@ def api_get_node():
     # ANTWOORDNODE (bijna altijd een tussenstap)
     # --------------------------------------------------------
     if ntype == "antwoord":
-        antwoordtekst = extract_answer_value(node)
+        antwoordtekst = boom_index["antwoorden"][str(node_id)]
         volgende = node.get("next", [])
 
         return jsonify({
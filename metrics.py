@@ -0,0 +1,352 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+
+# =========================
+# METRICS (PROMETHEUS-TEKSTFORMAAT)
+# =========================
+# Tellers en histogrammen per /api-route, plus tellers voor domeinfouten.
+#
+# Onder gunicorn heeft elke worker zijn eigen geheugen. Zet METRICS_DIR op een
+# gedeelde (tmpfs-)map: elke worker schrijft zijn stand dan periodiek naar
+# <METRICS_DIR>/worker_<pid>_<token>.json en /metrics telt alle bestanden bij
+# elkaar op. Het token is per proces uniek: een hergebruikte pid overschrijft
+# dus nooit de stand van een eerdere worker.
+#
+# Levenscyclus (hooks in gunicorn.conf.py):
+#   - on_starting: de master maakt de map leeg (leeg_map), een nieuwe start
+#     begint bij nul, zoals Prometheus ook verwacht na een herstart;
+#   - child_exit:  de stand van een gestopte worker wordt opgeteld in
+#     archief.json en zijn bestand verdwijnt (archiveer_worker), zodat tellers
+#     niet teruglopen en de map niet blijft groeien.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+METRICS_DIR = os.environ.get("METRICS_DIR")
+FLUSH_INTERVAL = 1.0
+
+ARCHIEF_BESTAND = "archief.json"
+
+SCHEIDING = "\t"
+
+_LOCK = threading.Lock()
+_LAATSTE_FLUSH = 0.0
+
+_TOKEN = None
+_TOKEN_PID = None
+
+
+def _lege_stand():
+    return {
+        "requests": {},
+        "latency": {},
+        "request_size": {},
+        "response_size": {},
+        "domeinfouten": {},
+    }
+
+
+_STAND = _lege_stand()
+
+
+def _observeer(histogrammen, sleutel, buckets, waarde):
+    histogram = histogrammen.get(sleutel)
+    if histogram is None:
+        histogram = histogrammen[sleutel] = {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0}
+
+    for i, grens in enumerate(buckets):
+        if waarde <= grens:
+            histogram["buckets"][i] += 1
+
+    histogram["sum"] += waarde
+    histogram["count"] += 1
+
+
+def registreer_request(route, methode, status, duur_s, request_bytes, response_bytes):
+    sleutel = SCHEIDING.join((route, methode))
+
+    with _LOCK:
+        teller = SCHEIDING.join((route, methode, str(status)))
+        _STAND["requests"][teller] = _STAND["requests"].get(teller, 0) + 1
+
+        _observeer(_STAND["latency"], sleutel, LATENCY_BUCKETS, duur_s)
+
+        if request_bytes is not None:
+            _observeer(_STAND["request_size"], sleutel, SIZE_BUCKETS, request_bytes)
+
+        if response_bytes is not None:
+            _observeer(_STAND["response_size"], sleutel, SIZE_BUCKETS, response_bytes)
+
+    _misschien_flushen()
+
+
+def tel_domeinfout(soort):
+    with _LOCK:
+        _STAND["domeinfouten"][soort] = _STAND["domeinfouten"].get(soort, 0) + 1
+
+
+# =========================
+# MULTI-WORKER
+# =========================
+def _worker_token():
+    """pid + willekeurig deel; na een fork (nieuwe pid) automatisch opnieuw."""
+    global _TOKEN, _TOKEN_PID
+
+    if _TOKEN_PID != os.getpid():
+        _TOKEN_PID = os.getpid()
+        _TOKEN = f"{_TOKEN_PID}_{uuid.uuid4().hex[:12]}"
+
+    return _TOKEN
+
+
+def _worker_bestand():
+    return os.path.join(METRICS_DIR, f"worker_{_worker_token()}.json")
+
+
+def _schrijf_atomair(pad, inhoud):
+    tijdelijk = pad + ".tmp"
+
+    with open(tijdelijk, "w", encoding="utf-8") as f:
+        f.write(inhoud)
+
+    os.replace(tijdelijk, pad)
+
+
+def _lees(pad):
+    with open(pad, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def flush():
+    if not METRICS_DIR:
+        return
+
+    with _LOCK:
+        inhoud = json.dumps(_STAND)
+
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    _schrijf_atomair(_worker_bestand(), inhoud)
+
+
+def _misschien_flushen():
+    global _LAATSTE_FLUSH
+
+    if not METRICS_DIR:
+        return
+
+    nu = time.monotonic()
+    if nu - _LAATSTE_FLUSH < FLUSH_INTERVAL:
+        return
+
+    _LAATSTE_FLUSH = nu
+    try:
+        flush()
+    except OSError as e:
+        print("❌ metrics flush mislukt:", e)
+
+
+def reset_na_fork():
+    """Na een fork (gunicorn preload) begint de worker met een lege stand."""
+    global _STAND, _LOCK, _LAATSTE_FLUSH
+    _LOCK = threading.Lock()
+    _STAND = _lege_stand()
+    _LAATSTE_FLUSH = 0.0
+
+
+def leeg_map():
+    """Master, bij het starten: standen en archief van een vorige run weghalen."""
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return
+
+    for naam in os.listdir(METRICS_DIR):
+        if naam.startswith("worker_") or naam.startswith(ARCHIEF_BESTAND):
+            try:
+                os.remove(os.path.join(METRICS_DIR, naam))
+            except OSError:
+                pass
+
+
+def _lees_archief():
+    try:
+        archief = _lees(os.path.join(METRICS_DIR, ARCHIEF_BESTAND))
+    except (OSError, ValueError):
+        return {"stand": _lege_stand(), "samengevoegd": []}
+
+    archief.setdefault("stand", _lege_stand())
+    archief.setdefault("samengevoegd", [])
+    return archief
+
+
+def archiveer_worker(pid):
+    """
+    Master, na het stoppen van worker `pid`: zijn stand optellen in het archief
+    en daarna zijn bestand verwijderen. Het archief onthoudt welke bestanden
+    erin zitten, zodat een gelijktijdige /metrics ze nooit dubbel telt.
+    """
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return
+
+    prefix = f"worker_{pid}_"
+    namen = [n for n in os.listdir(METRICS_DIR) if n.startswith(prefix) and n.endswith(".json")]
+    if not namen:
+        return
+
+    archief = _lees_archief()
+    aanwezig = set(os.listdir(METRICS_DIR))
+
+    # 🔑 alleen namen bewaren waarvan het bestand nog bestaat
+    samengevoegd = [n for n in archief["samengevoegd"] if n in aanwezig]
+
+    for naam in namen:
+        try:
+            _tel_op(archief["stand"], _lees(os.path.join(METRICS_DIR, naam)))
+        except (OSError, ValueError):
+            continue
+        samengevoegd.append(naam)
+
+    archief["samengevoegd"] = samengevoegd
+    _schrijf_atomair(os.path.join(METRICS_DIR, ARCHIEF_BESTAND), json.dumps(archief))
+
+    for naam in namen:
+        try:
+            os.remove(os.path.join(METRICS_DIR, naam))
+        except OSError:
+            pass
+
+
+def _tel_op(totaal, stand):
+    for soort in ("requests", "domeinfouten"):
+        for sleutel, waarde in stand.get(soort, {}).items():
+            totaal[soort][sleutel] = totaal[soort].get(sleutel, 0) + waarde
+
+    for soort in ("latency", "request_size", "response_size"):
+        for sleutel, histogram in stand.get(soort, {}).items():
+            doel = totaal[soort].get(sleutel)
+            if doel is None:
+                totaal[soort][sleutel] = {
+                    "buckets": list(histogram["buckets"]),
+                    "sum": histogram["sum"],
+                    "count": histogram["count"],
+                }
+                continue
+
+            doel["buckets"] = [a + b for a, b in zip(doel["buckets"], histogram["buckets"])]
+            doel["sum"] += histogram["sum"]
+            doel["count"] += histogram["count"]
+
+
+def verzamelde_stand():
+    """Stand van deze worker, plus die van alle andere workers en het archief in METRICS_DIR."""
+    totaal = _lege_stand()
+
+    with _LOCK:
+        _tel_op(totaal, _STAND)
+
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return totaal
+
+    eigen = os.path.basename(_worker_bestand())
+    standen = {}
+
+    for naam in os.listdir(METRICS_DIR):
+        if not naam.startswith("worker_") or not naam.endswith(".json") or naam == eigen:
+            continue
+
+        try:
+            standen[naam] = _lees(os.path.join(METRICS_DIR, naam))
+        except (OSError, ValueError):
+            continue
+
+    # archief ná de workerbestanden lezen: een bestand dat intussen is
+    # gearchiveerd staat dan in "samengevoegd" en telt maar één keer
+    archief = _lees_archief()
+    _tel_op(totaal, archief["stand"])
+
+    samengevoegd = set(archief["samengevoegd"])
+    for naam, stand in standen.items():
+        if naam not in samengevoegd:
+            _tel_op(totaal, stand)
+
+    return totaal
+
+
+# =========================
+# PROMETHEUS-TEKST
+# =========================
+def _labels(**labels):
+    delen = []
+    for naam, waarde in labels.items():
+        waarde = str(waarde).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        delen.append(f'{naam}="{waarde}"')
+    return "{" + ",".join(delen) + "}"
+
+
+def _histogram_regels(naam, histogrammen, buckets):
+    regels = []
+
+    for sleutel in sorted(histogrammen):
+        route, methode = sleutel.split(SCHEIDING)
+        histogram = histogrammen[sleutel]
+
+        for grens, aantal in zip(buckets, histogram["buckets"]):
+            regels.append(f"{naam}_bucket{_labels(route=route, method=methode, le=grens)} {aantal}")
+
+        regels.append(f"{naam}_bucket{_labels(route=route, method=methode, le='+Inf')} {histogram['count']}")
+        regels.append(f"{naam}_sum{_labels(route=route, method=methode)} {histogram['sum']}")
+        regels.append(f"{naam}_count{_labels(route=route, method=methode)} {histogram['count']}")
+
+    return regels
+
+
+def prometheus_tekst():
+    stand = verzamelde_stand()
+
+    regels = [
+        "# HELP keuzegids_http_requests_total Aantal API-requests per route, methode en status.",
+        "# TYPE keuzegids_http_requests_total counter",
+    ]
+    for sleutel in sorted(stand["requests"]):
+        route, methode, status = sleutel.split(SCHEIDING)
+        regels.append(
+            f"keuzegids_http_requests_total{_labels(route=route, method=methode, status=status)} "
+            f"{stand['requests'][sleutel]}"
+        )
+
+    regels += [
+        "# HELP keuzegids_http_request_duration_seconds Verwerkingstijd per API-request.",
+        "# TYPE keuzegids_http_request_duration_seconds histogram",
+    ]
+    regels += _histogram_regels("keuzegids_http_request_duration_seconds", stand["latency"], LATENCY_BUCKETS)
+
+    regels += [
+        "# HELP keuzegids_http_request_size_bytes Grootte van de request-body.",
+        "# TYPE keuzegids_http_request_size_bytes histogram",
+    ]
+    regels += _histogram_regels("keuzegids_http_request_size_bytes", stand["request_size"], SIZE_BUCKETS)
+
+    regels += [
+        "# HELP keuzegids_http_response_size_bytes Grootte van de response-body.",
+        "# TYPE keuzegids_http_response_size_bytes histogram",
+    ]
+    regels += _histogram_regels("keuzegids_http_response_size_bytes", stand["response_size"], SIZE_BUCKETS)
+
+    regels += [
+        "# HELP keuzegids_domein_fouten_total Domeinfouten zoals m2_te_klein of geen passende staffel.",
+        "# TYPE keuzegids_domein_fouten_total counter",
+    ]
+    for soort in sorted(stand["domeinfouten"]):
+        regels.append(f"keuzegids_domein_fouten_total{_labels(soort=soort)} {stand['domeinfouten'][soort]}")
+
+    return "\n".join(regels) + "\n"
+
+
+@atexit.register
+def _flush_bij_afsluiten():
+    try:
+        flush()
+    except OSError:
+        pass
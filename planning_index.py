@@ -0,0 +1,86 @@
+from bisect import bisect_right
+
+# =========================
+# PLANNING INDEX
+# =========================
+# tabellen_planning.json wordt bij het laden gecompileerd:
+# - naam én aliases (lowercase) → systeem, met planning_ref al gevolgd
+# - per bewerking een gesorteerde tuple met max_m2 voor binary search
+
+
+def _compileer_bewerking(systeem_naam, bewerking):
+    regels = bewerking.get("regels", [])
+    if not regels:
+        raise ValueError(f"planning '{systeem_naam}': bewerking '{bewerking.get('naam')}' heeft geen regels")
+
+    grenzen = tuple(regel["max_m2"] for regel in regels)
+    if list(grenzen) != sorted(grenzen):
+        raise ValueError(
+            f"planning '{systeem_naam}': regels van '{bewerking.get('naam')}' niet oplopend op max_m2"
+        )
+
+    return dict(bewerking, max_m2_grenzen=grenzen)
+
+
+def compileer_planning(planning_data):
+    systemen = planning_data.get("systemen", [])
+
+    # 1️⃣ naam/alias → naam (eerste treffer wint, zoals de oude lineaire zoektocht)
+    namen = {}
+    per_naam = {}
+
+    for systeem in systemen:
+        per_naam.setdefault(systeem["naam"], systeem)
+        namen.setdefault(systeem["naam"].lower(), systeem["naam"])
+
+        for alias in systeem.get("aliases", []):
+            namen.setdefault(alias.lower(), systeem["naam"])
+
+    # 2️⃣ planning_ref volgen (met cyclusdetectie)
+    opgelost = {}
+
+    for naam, systeem in per_naam.items():
+        bezocht = [naam]
+
+        while systeem.get("planning_ref"):
+            ref = systeem["planning_ref"]
+            ref_naam = namen.get(ref.lower())
+
+            if not ref_naam:
+                raise ValueError(f"planning_ref niet gevonden: {ref}")
+
+            if ref_naam in bezocht:
+                raise ValueError(f"planning_ref cyclus: {' → '.join(bezocht + [ref_naam])}")
+
+            bezocht.append(ref_naam)
+            systeem = per_naam[ref_naam]
+
+        opgelost[naam] = systeem
+
+    # 3️⃣ bewerkingen compileren (één keer per doelsysteem)
+    gecompileerd = {}
+
+    for naam, systeem in opgelost.items():
+        doel = systeem["naam"]
+        if doel not in gecompileerd:
+            gecompileerd[doel] = dict(
+                systeem,
+                bewerkingen=[_compileer_bewerking(doel, b) for b in systeem.get("bewerkingen", [])]
+            )
+
+    return {
+        "systemen": {
+            sleutel: gecompileerd[opgelost[naam]["naam"]]
+            for sleutel, naam in namen.items()
+        }
+    }
+
+
+def zoek_planning_systeem(planning, naam):
+    return planning["systemen"].get(naam.lower())
+
+
+def zoek_regel(bewerking, m2):
+    """Laatste regel met max_m2 <= m2, anders de eerste regel."""
+    index = bisect_right(bewerking["max_m2_grenzen"], m2) - 1
+    return bewerking["regels"][max(index, 0)]
@@ -0,0 +1,256 @@
+"""
+Export van de volledige prijsmatrix (coating + polijsten) als platte tabel.
+
+    python prijs_export.py                          # NDJSON naar stdout
+    python prijs_export.py --formaat csv -o prijzen.csv
+    python prijs_export.py --m2 30,75,150,500       # plus voorbeeldprijzen per oppervlakte
+
+Zelfde generators als GET /api/export/prijzen: rij voor rij, dus het
+geheugengebruik hangt niet af van de grootte van de prijstabellen en de
+ontvanger kan meteen beginnen met inlezen.
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+from itertools import chain
+
+import serialisatie
+from staffels import parse_bereik
+
+# =========================
+# KOLOMMEN
+# =========================
+# soort:   coating | extra_systeem | extra | polijst | voorbeeld_coating | voorbeeld_polijst
+# variant: aantal ruimtes (coating) of klanttype (polijsten)
+# eenheid: per_m2 of vast
+KOLOMMEN = (
+    "soort", "systeem", "variant", "staffel", "staffel_index", "m2_van", "m2_tot",
+    "eenheid", "prijs", "oppervlakte", "totaal", "fout",
+)
+
+FORMATEN = ("ndjson", "csv")
+MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# rijen worden per ~64 KB verstuurd in plaats van per rij
+CHUNK_BYTES = 64 * 1024
+
+MAX_VOORBEELD_M2 = 100
+
+# zelfde grens als oppervlakte in de prijsschema's van App.py
+MAX_OPPERVLAKTE = 100000
+
+
+def _rij(**waarden):
+    return {kolom: waarden.get(kolom) for kolom in KOLOMMEN}
+
+
+def _staffel_rijen(soort, naam, tabel, eenheid_voor_index=None):
+    staffel = tabel.get("staffel", [])
+
+    for variant, prijzen in tabel.get("prijzen", {}).items():
+        for index, (bereik, prijs) in enumerate(zip(staffel, prijzen)):
+            m2_van, m2_tot = parse_bereik(bereik)
+            yield _rij(
+                soort=soort,
+                systeem=naam,
+                variant=variant,
+                staffel=bereik,
+                staffel_index=index,
+                m2_van=m2_van,
+                m2_tot=None if m2_tot == float("inf") else m2_tot,
+                eenheid=eenheid_voor_index(index) if eenheid_voor_index else "per_m2",
+                prijs=prijs,
+            )
+
+
+# =========================
+# RIJEN (GENERATORS)
+# =========================
+def matrix_rijen(snapshot):
+    """Alle prijzen uit PRIJS_DATA en POLIJST_DATA, één rij per staffeltrede en variant."""
+    prijs_data = snapshot["prijs_data"]
+
+    for naam, tabel in prijs_data.get("systemen", {}).items():
+        yield from _staffel_rijen("coating", naam, tabel)
+
+    for naam, tabel in prijs_data.get("extra_systemen", {}).items():
+        yield from _staffel_rijen("extra_systeem", naam, tabel)
+
+    for key, extra in prijs_data.get("extras", {}).items():
+        yield _rij(
+            soort="extra",
+            systeem=key,
+            eenheid="per_m2" if extra.get("type") == "per_m2" else "vast",
+            prijs=extra.get("prijs", 0),
+        )
+
+    for naam, tabel in snapshot["polijst_data"].get("systemen", {}).items():
+        vast_index = tabel.get("vast_tot_index", -1)
+        yield from _staffel_rijen(
+            "polijst", naam, tabel,
+            lambda index, vast_index=vast_index: "vast" if index <= vast_index else "per_m2"
+        )
+
+
+def voorbeeld_rijen(snapshot, oppervlaktes, bereken_coating_prijs, bereken_polijst_prijs):
+    """
+    Per systeem/variant/oppervlakte de prijs volgens de gewone prijsberekening
+    (zonder extras). Niet te berekenen combinaties krijgen een rij met "fout".
+    """
+    for naam, tabel in snapshot["prijs_data"].get("systemen", {}).items():
+        for variant in tabel.get("prijzen", {}):
+            for m2 in oppervlaktes:
+                yield _voorbeeld_veilig(
+                    "voorbeeld_coating", naam, variant, m2,
+                    bereken_coating_prijs, {"systeem": naam, "oppervlakte": m2, "ruimtes": variant}
+                )
+
+    for naam, tabel in snapshot["polijst_data"].get("systemen", {}).items():
+        for variant in tabel.get("prijzen", {}):
+            for m2 in oppervlaktes:
+                yield _voorbeeld_veilig(
+                    "voorbeeld_polijst", naam, variant, m2,
+                    bereken_polijst_prijs, {"systeem": naam, "klanttype": variant, "oppervlakte": m2}
+                )
+
+
+def _voorbeeld_veilig(soort, naam, variant, m2, bereken, data):
+    # de headers zijn al verstuurd: een fout mag de stream niet afbreken
+    try:
+        payload, status = bereken(data)
+    except Exception as e:
+        return _rij(soort=soort, systeem=naam, variant=variant, oppervlakte=m2, fout=str(e) or type(e).__name__)
+
+    return _voorbeeld(soort, naam, variant, m2, payload, status)
+
+
+def _voorbeeld(soort, naam, variant, m2, payload, status):
+    if status != 200 or "error" in payload:
+        return _rij(soort=soort, systeem=naam, variant=variant, oppervlakte=m2, fout=payload.get("error"))
+
+    # polijsten in een vaste staffel: geen prijs per m², wel een vast bedrag
+    prijs_per_m2 = payload.get("prijs_per_m2")
+
+    return _rij(
+        soort=soort,
+        systeem=naam,
+        variant=variant,
+        eenheid="vast" if prijs_per_m2 is None else "per_m2",
+        prijs=payload.get("basis_totaal") if prijs_per_m2 is None else prijs_per_m2,
+        oppervlakte=m2,
+        totaal=payload.get("totaalprijs"),
+    )
+
+
+# =========================
+# FORMATEN
+# =========================
+def _in_chunks(regels):
+    buffer = []
+    grootte = 0
+
+    for regel in regels:
+        buffer.append(regel)
+        grootte += len(regel)
+
+        if grootte >= CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer = []
+            grootte = 0
+
+    if buffer:
+        yield b"".join(buffer)
+
+
+def als_ndjson(rijen):
+    return _in_chunks(serialisatie.dumps(rij) + b"\n" for rij in rijen)
+
+
+def als_csv(rijen):
+    def regels():
+        uitvoer = io.StringIO()
+        schrijver = csv.writer(uitvoer, lineterminator="\n")
+
+        schrijver.writerow(KOLOMMEN)
+        for rij in rijen:
+            schrijver.writerow(["" if rij[k] is None else rij[k] for k in KOLOMMEN])
+            yield uitvoer.getvalue().encode("utf-8")
+            uitvoer.seek(0)
+            uitvoer.truncate()
+
+        yield uitvoer.getvalue().encode("utf-8")
+
+    return _in_chunks(regels())
+
+
+def coderen(rijen, formaat):
+    return als_csv(rijen) if formaat == "csv" else als_ndjson(rijen)
+
+
+def parse_oppervlaktes(waarde):
+    """'30,75,150' → [30.0, 75.0, 150.0]"""
+    if not waarde:
+        return []
+
+    oppervlaktes = []
+    for deel in str(waarde).split(","):
+        deel = deel.strip()
+        if not deel:
+            continue
+        try:
+            m2 = float(deel)
+        except ValueError:
+            raise ValueError(f"ongeldige oppervlakte: {deel}")
+        if not 0 < m2 <= MAX_OPPERVLAKTE:
+            raise ValueError(f"ongeldige oppervlakte: {deel} (maximaal {MAX_OPPERVLAKTE})")
+        oppervlaktes.append(m2)
+
+    if len(oppervlaktes) > MAX_VOORBEELD_M2:
+        raise ValueError(f"maximaal {MAX_VOORBEELD_M2} oppervlaktes")
+
+    return oppervlaktes
+
+
+# =========================
+# CLI
+# =========================
+def main():
+    parser = argparse.ArgumentParser(description="Prijsmatrix exporteren (NDJSON of CSV)")
+    parser.add_argument("--formaat", choices=FORMATEN, default="ndjson")
+    parser.add_argument("--m2", default="", help="voorbeeldoppervlaktes, bv. 30,75,150")
+    parser.add_argument("-o", "--uitvoer", help="bestand (standaard stdout)")
+    args = parser.parse_args()
+
+    try:
+        oppervlaktes = parse_oppervlaktes(args.m2)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # geen watcher-thread voor een eenmalige export; App-meldingen naar stderr
+    os.environ["DATA_RELOAD_INTERVAL"] = "0"
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    import App
+    sys.stdout = stdout
+
+    snapshot = App.huidige_snapshot()
+    rijen = matrix_rijen(snapshot)
+
+    if oppervlaktes:
+        rijen = chain(rijen, voorbeeld_rijen(
+            snapshot, oppervlaktes, App.bereken_coating_prijs, App.bereken_polijst_prijs
+        ))
+
+    uitvoer = open(args.uitvoer, "wb") if args.uitvoer else sys.stdout.buffer
+    try:
+        for chunk in coderen(rijen, args.formaat):
+            uitvoer.write(chunk)
+    finally:
+        if args.uitvoer:
+            uitvoer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import numpy as np
+
+# =========================
+# PRIJSCURVE (GEVECTORISEERD)
+# =========================
+# Prijs per m² en totaalprijs voor alle coatingsystemen over een reeks
+# oppervlaktes, in één keer berekend met numpy over de gecompileerde staffels
+# (zie staffels.py) in plaats van calculate_price per punt.
+
+MAX_PUNTEN = 20000
+
+
+def m2_reeks(van, tot, stap):
+    if not all(np.isfinite([van, tot, stap])):
+        raise ValueError("van, tot en stap moeten eindige getallen zijn")
+
+    if stap <= 0:
+        raise ValueError("stap moet groter dan 0 zijn")
+
+    if tot < van:
+        raise ValueError("tot moet groter of gelijk aan van zijn")
+
+    # eerst als float controleren: een piepkleine stap geeft anders inf/overflow
+    aantal = np.floor((tot - van) / stap + 1e-9) + 1
+    if not np.isfinite(aantal) or aantal > MAX_PUNTEN:
+        raise ValueError(f"maximaal {MAX_PUNTEN} punten per curve")
+
+    return van + np.arange(int(aantal)) * stap
+
+
+def staffel_prijzen(gecompileerd, prijzen, m2):
+    """Prijs per m² voor elk punt in m2; NaN waar geen staffel past."""
+    ondergrens, bovengrenzen = gecompileerd
+
+    index = np.searchsorted(np.asarray(bovengrenzen), m2, side="left")
+    geldig = (m2 >= ondergrens) & (index < len(bovengrenzen))
+
+    prijs_per_m2 = np.asarray(prijzen, dtype=float)[np.minimum(index, len(bovengrenzen) - 1)]
+    return np.where(geldig, prijs_per_m2, np.nan)
+
+
+def break_even_punten(m2, totalen):
+    """
+    Oppervlaktes waar de volgorde tussen twee systemen omslaat:
+    vanaf "m2" is "goedkoper" goedkoper dan "duurder".
+    """
+    namen = list(totalen)
+    punten = []
+
+    for i, naam_a in enumerate(namen):
+        for naam_b in namen[i + 1:]:
+            verschil = totalen[naam_a] - totalen[naam_b]
+            teken = np.sign(verschil)
+
+            # alleen punten waar beide systemen een prijs hebben en niet gelijk zijn
+            bruikbaar = np.flatnonzero(~np.isnan(teken) & (teken != 0))
+            if len(bruikbaar) < 2:
+                continue
+
+            omslag = np.flatnonzero(teken[bruikbaar[1:]] != teken[bruikbaar[:-1]]) + 1
+
+            for pos in bruikbaar[omslag]:
+                a_goedkoper = teken[pos] < 0
+                punten.append({
+                    "m2": float(m2[pos]),
+                    "goedkoper": naam_a if a_goedkoper else naam_b,
+                    "duurder": naam_b if a_goedkoper else naam_a,
+                })
+
+    punten.sort(key=lambda p: p["m2"])
+    return punten
+
+
+def _als_lijst(waarden):
+    return [None if np.isnan(w) else float(w) for w in waarden]
+
+
+def bereken_prijscurve(systemen, staffels, m2, ruimtes_lijst, min_m2=30):
+    """
+    systemen: {naam: prijstabel} uit PRIJS_DATA["systemen"]
+    staffels: {naam: gecompileerde staffel}
+    """
+    resultaat = {
+        "m2": [float(x) for x in m2],
+        "ruimtes": {}
+    }
+
+    te_klein = m2 < min_m2
+
+    for ruimtes in ruimtes_lijst:
+        per_systeem = {}
+        totalen = {}
+
+        for naam, tabel in systemen.items():
+            prijzen = tabel.get("prijzen", {}).get(str(ruimtes))
+            if not prijzen:
+                continue
+
+            prijs_per_m2 = staffel_prijzen(staffels[naam], prijzen, m2)
+            prijs_per_m2[te_klein] = np.nan
+
+            totaal = np.round(prijs_per_m2 * m2)
+            totalen[naam] = totaal
+
+            per_systeem[naam] = {
+                "prijs_per_m2": _als_lijst(np.round(prijs_per_m2, 2)),
+                "totaal": _als_lijst(totaal),
+            }
+
+        resultaat["ruimtes"][str(ruimtes)] = {
+            "systemen": per_systeem,
+            "break_even": break_even_punten(m2, totalen),
+        }
+
+    return resultaat
@@ -0,0 +1,213 @@
+import math
+
+# =========================
+# REQUEST-SCHEMA'S
+# =========================
+# Per POST-endpoint een declaratief schema, bij het importeren één keer
+# gecompileerd tot een validator. Een validator zet typen om ("12" → 12.0),
+# vult standaardwaarden in en geeft een nieuw, genormaliseerd object terug;
+# de payload van de client wordt nooit aangepast. Bij ongeldige invoer volgt
+# een ValueError met het pad naar het veld, bv. "extras[3]: tekst verwacht".
+#
+# Onbekende velden worden genegeerd (clients sturen vaak meer mee).
+
+ONTBREEKT = object()
+
+
+# =========================
+# VELDTYPEN
+# =========================
+def getal(verplicht=False, standaard=None, min=None, max=None):
+    return {"type": "getal", "verplicht": verplicht, "standaard": standaard, "min": min, "max": max}
+
+
+def geheel(verplicht=False, standaard=None, min=None, max=None):
+    return {"type": "geheel", "verplicht": verplicht, "standaard": standaard, "min": min, "max": max}
+
+
+def tekst(verplicht=False, standaard=None, max_lengte=200):
+    return {"type": "tekst", "verplicht": verplicht, "standaard": standaard, "max_lengte": max_lengte}
+
+
+def keuze(opties, standaard=None):
+    return {"type": "keuze", "verplicht": False, "standaard": standaard, "opties": tuple(opties)}
+
+
+def ja_nee(standaard=False):
+    return {"type": "ja_nee", "verplicht": False, "standaard": standaard}
+
+
+def lijst(item, max_items, verplicht=False):
+    return {"type": "lijst", "verplicht": verplicht, "standaard": (), "item": item, "max_items": max_items}
+
+
+def object_(velden, verplicht=False):
+    return {"type": "object", "verplicht": verplicht, "standaard": None, "velden": velden}
+
+
+def een_van(*varianten, verplicht=True):
+    """Eerste variant die past (bv. een extra als tekst óf als {"key", "m2"})."""
+    return {"type": "een_van", "verplicht": verplicht, "standaard": None, "varianten": varianten}
+
+
+# =========================
+# COMPILEREN
+# =========================
+def _leeg(waarde):
+    return waarde is None or (isinstance(waarde, str) and not waarde.strip())
+
+
+def _grenzen(spec, waarde, pad):
+    if spec["min"] is not None and waarde < spec["min"]:
+        raise ValueError(f"{pad}: minimaal {spec['min']}")
+    if spec["max"] is not None and waarde > spec["max"]:
+        raise ValueError(f"{pad}: maximaal {spec['max']}")
+    return waarde
+
+
+def _compileer_getal(spec):
+    def valideer(waarde, pad):
+        if isinstance(waarde, bool):
+            raise ValueError(f"{pad}: getal verwacht")
+        try:
+            waarde = float(waarde)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{pad}: getal verwacht")
+        if not math.isfinite(waarde):
+            raise ValueError(f"{pad}: getal verwacht")
+        return _grenzen(spec, waarde, pad)
+    return valideer
+
+
+def _compileer_geheel(spec):
+    def valideer(waarde, pad):
+        if isinstance(waarde, bool):
+            raise ValueError(f"{pad}: geheel getal verwacht")
+        try:
+            getal_ = float(waarde)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{pad}: geheel getal verwacht")
+        if not getal_.is_integer():
+            raise ValueError(f"{pad}: geheel getal verwacht")
+        return _grenzen(spec, int(getal_), pad)
+    return valideer
+
+
+def _compileer_tekst(spec):
+    max_lengte = spec["max_lengte"]
+
+    def valideer(waarde, pad):
+        if not isinstance(waarde, str):
+            raise ValueError(f"{pad}: tekst verwacht")
+        if len(waarde) > max_lengte:
+            raise ValueError(f"{pad}: maximaal {max_lengte} tekens")
+        return waarde
+    return valideer
+
+
+def _compileer_keuze(spec):
+    opties = spec["opties"]
+
+    def valideer(waarde, pad):
+        if waarde not in opties:
+            raise ValueError(f"{pad}: moet een van {list(opties)} zijn")
+        return waarde
+    return valideer
+
+
+JA = {"true", "ja", "1"}
+NEE = {"false", "nee", "0"}
+
+
+def _compileer_ja_nee(spec):
+    def valideer(waarde, pad):
+        if isinstance(waarde, bool):
+            return waarde
+        if isinstance(waarde, (int, float)) and waarde in (0, 1):
+            return bool(waarde)
+        if isinstance(waarde, str) and waarde.strip().lower() in JA | NEE:
+            return waarde.strip().lower() in JA
+        raise ValueError(f"{pad}: true of false verwacht")
+    return valideer
+
+
+def _compileer_lijst(spec):
+    item = compileer_veld(spec["item"])
+    max_items = spec["max_items"]
+
+    def valideer(waarde, pad):
+        if not isinstance(waarde, (list, tuple)):
+            raise ValueError(f"{pad}: lijst verwacht")
+        if len(waarde) > max_items:
+            raise ValueError(f"{pad}: maximaal {max_items} items")
+        return [item(w, f"{pad}[{i}]") for i, w in enumerate(waarde)]
+    return valideer
+
+
+def _compileer_object(spec):
+    velden = tuple((naam, compileer_veld(veld)) for naam, veld in spec["velden"].items())
+
+    def valideer(waarde, pad):
+        if not isinstance(waarde, dict):
+            raise ValueError(f"{pad or 'body'}: object verwacht")
+
+        uit = {}
+        for naam, veld in velden:
+            uit[naam] = veld(waarde.get(naam, ONTBREEKT), f"{pad}.{naam}" if pad else naam)
+        return uit
+    return valideer
+
+
+def _compileer_een_van(spec):
+    varianten = [compileer_veld(v) for v in spec["varianten"]]
+
+    def valideer(waarde, pad):
+        fouten = []
+        for variant in varianten:
+            try:
+                return variant(waarde, pad)
+            except ValueError as e:
+                fouten.append(str(e))
+        raise ValueError(fouten[0] if len(fouten) == 1 else f"{pad}: ongeldige waarde")
+    return valideer
+
+
+_COMPILERS = {
+    "getal": _compileer_getal,
+    "geheel": _compileer_geheel,
+    "tekst": _compileer_tekst,
+    "keuze": _compileer_keuze,
+    "ja_nee": _compileer_ja_nee,
+    "lijst": _compileer_lijst,
+    "object": _compileer_object,
+    "een_van": _compileer_een_van,
+}
+
+
+def compileer_veld(spec):
+    kern = _COMPILERS[spec["type"]](spec)
+    verplicht = spec["verplicht"]
+    standaard = spec["standaard"]
+    is_lijst = spec["type"] == "lijst"
+
+    def valideer(waarde, pad):
+        # ontbrekend, null of lege tekst: standaardwaarde (of fout als verplicht)
+        if waarde is ONTBREEKT or _leeg(waarde) or (is_lijst and waarde == []):
+            if verplicht:
+                raise ValueError(f"{pad}: verplicht")
+            return list(standaard) if is_lijst else standaard
+        return kern(waarde, pad)
+
+    return valideer
+
+
+def compileer(velden):
+    """Schema (veldnaam → veldtype) → functie(payload) → genormaliseerde dict."""
+    valideer = compileer_veld(object_(velden, verplicht=True))
+
+    def valideer_payload(data):
+        if data is None:
+            data = {}
+        return valideer(data, "")
+
+    return valideer_payload
@@ -0,0 +1,72 @@
+import json
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # stdlib-fallback
+    orjson = None
+
+# =========================
+# JSON SERIALISATIE
+# =========================
+# Alle responses gaan via de JSON-provider van de app (jsonify). Als orjson
+# geïnstalleerd is wordt dat gebruikt, anders de stdlib (zelfde uitvoer als
+# Flask standaard). JSON_ENCODER=stdlib forceert de stdlib.
+#
+# Voor gecachete payloads: dumps() geeft bytes terug die met bytes_response()
+# verstuurd worden zonder opnieuw te encoderen.
+
+if os.environ.get("JSON_ENCODER", "").lower() == "stdlib":
+    orjson = None
+
+ENCODER = "orjson" if orjson else "stdlib"
+
+if orjson:
+    # sort_keys zoals Flask; datums/dataclasses via Flask's default
+    ORJSON_OPTIES = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+_default = DefaultJSONProvider.default
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj, default=_default, ensure_ascii=True, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj):
+    """obj → JSON-bytes (compact, gesorteerde keys)."""
+    if orjson is None:
+        return stdlib_dumps(obj)
+
+    try:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIES)
+    except TypeError:
+        # bv. integers groter dan 64 bit: de stdlib kan het wel
+        return stdlib_dumps(obj)
+
+
+class SnelleJSONProvider(DefaultJSONProvider):
+    """Flask-provider die dumps() gebruikt; buiten debug-modus geen omweg via str."""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs or orjson is None:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        if self._app.debug or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        return bytes_response(self._app, dumps(obj) + b"\n")
+
+
+def bytes_response(app, body, status=200):
+    """Response met vooraf geserialiseerde JSON-bytes."""
+    return app.response_class(body, status=status, mimetype=app.json.mimetype)
@@ -0,0 +1,100 @@
+import math
+from bisect import bisect_left
+
+# =========================
+# STAFFELS (PRIJSTREDEN) COMPILEREN
+# =========================
+# Een staffel als ["30-50", "50-70", ..., "1000+"] wordt bij het laden omgezet
+# naar (ondergrens, bovengrenzen). Opzoeken is daarna een binary search.
+#
+# Aansluitende treden mogen een grens delen ("30-50", "50-70": 50 hoort bij
+# de eerste) of op hele m² aansluiten ("31-40", "41-50": 40,5 hoort bij de
+# tweede). Overlap of een gat geeft een ValueError bij het laden.
+
+
+def parse_bereik(bereik):
+    """'31-40' → (31.0, 40.0), '101+' → (101.0, inf)"""
+    bereik = str(bereik).strip()
+
+    if bereik.endswith("+"):
+        return float(bereik[:-1]), math.inf
+
+    min_m2, max_m2 = map(float, bereik.split("-"))
+    return min_m2, max_m2
+
+
+def compileer_staffel(staffel, naam="staffel"):
+    if not staffel:
+        raise ValueError(f"{naam}: lege staffel")
+
+    ondergrens = None
+    bovengrenzen = []
+
+    for index, bereik in enumerate(staffel):
+        try:
+            min_m2, max_m2 = parse_bereik(bereik)
+        except ValueError:
+            raise ValueError(f"{naam}: ongeldige staffel '{bereik}'")
+
+        if min_m2 > max_m2:
+            raise ValueError(f"{naam}: staffel '{bereik}' loopt achteruit")
+
+        if index == 0:
+            ondergrens = min_m2
+
+        else:
+            vorige_max = bovengrenzen[-1]
+
+            if vorige_max == math.inf:
+                raise ValueError(f"{naam}: staffel na open staffel '{staffel[index - 1]}'")
+
+            if min_m2 < vorige_max:
+                raise ValueError(
+                    f"{naam}: staffels '{staffel[index - 1]}' en '{bereik}' overlappen"
+                )
+
+            if min_m2 not in (vorige_max, vorige_max + 1):
+                raise ValueError(
+                    f"{naam}: gat tussen staffels '{staffel[index - 1]}' en '{bereik}'"
+                )
+
+        bovengrenzen.append(max_m2)
+
+    return ondergrens, tuple(bovengrenzen)
+
+
+def zoek_staffel(gecompileerd, m2):
+    """Index van de passende staffel, of None als m2 buiten alle staffels valt."""
+    ondergrens, bovengrenzen = gecompileerd
+
+    if m2 < ondergrens:
+        return None
+
+    index = bisect_left(bovengrenzen, m2)
+    if index == len(bovengrenzen):
+        return None
+
+    return index
+
+
+def compileer_prijstabellen(tabellen, naam):
+    """
+    Compileert de staffel van elk systeem in een prijstabel-dict
+    ({systeemnaam: {"staffel": [...], "prijzen": {...}}}) en controleert
+    dat elke prijzenlijst even lang is als de staffel.
+    """
+    gecompileerd = {}
+
+    for systeem, tabel in tabellen.items():
+        label = f"{naam} '{systeem}'"
+        staffel = tabel.get("staffel", [])
+
+        gecompileerd[systeem] = compileer_staffel(staffel, label)
+
+        for sleutel, prijzen in tabel.get("prijzen", {}).items():
+            if len(prijzen) != len(staffel):
+                raise ValueError(
+                    f"{label}: {len(prijzen)} prijzen voor '{sleutel}' bij {len(staffel)} staffels"
+                )
+
+    return gecompileerd
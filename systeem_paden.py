@@ -0,0 +1,148 @@
+from boom_index import extract_system_name
+
+# =========================
+# OMGEKEERDE INDEX: SYSTEEM → ANTWOORDPADEN
+# =========================
+# "Welke antwoorden leiden naar Gietcoating Premium?" Bij het laden wordt per
+# systeemnaam (hoofdletter-ongevoelig) een prefix-trie gebouwd van alle paden
+# vanaf de start-node naar een systeem-node met die naam. Gedeelde begin-
+# stukken staan er één keer in, en een deelboom die via meerdere ouders
+# bereikbaar is wordt gedeeld (zelfde tuple-object).
+#
+# Trie-node: (node_id, kinderen); een systeem-node met de gezochte naam is
+# een blad met kinderen ().
+
+
+def _systeem_naam_sleutel(naam):
+    return naam.strip().lower()
+
+
+def _bouw_trie(boom, bereikbaar, start_id, doel_ids):
+    """Trie van alle paden start_id → een van doel_ids (None als er geen pad is)."""
+    systeem_bits = bereikbaar["systeem_bits"]
+    masker = 0
+    for i, node_id in enumerate(bereikbaar["systemen"]):
+        if node_id in doel_ids:
+            masker |= 1 << i
+
+    cache = {}
+
+    def trie(node_id):
+        if node_id in cache:
+            return cache[node_id]
+
+        if not systeem_bits[node_id] & masker:
+            resultaat = None
+        elif node_id in doel_ids:
+            resultaat = (node_id, ())
+        else:
+            kinderen = []
+            for child, inline in boom["kinderen"][node_id]:
+                if inline:
+                    continue
+                sub = trie(str(child.get("id")))
+                if sub is not None:
+                    kinderen.append(sub)
+            resultaat = (node_id, tuple(kinderen))
+
+        cache[node_id] = resultaat
+        return resultaat
+
+    return trie(start_id)
+
+
+def tel_paden(trie):
+    aantallen = {}
+
+    def tel(t):
+        sleutel = id(t)
+        if sleutel not in aantallen:
+            aantallen[sleutel] = 1 if not t[1] else sum(tel(k) for k in t[1])
+        return aantallen[sleutel]
+
+    return tel(trie) if trie is not None else 0
+
+
+def compileer_systeem_paden(boom, bereikbaar, planning, start_id):
+    """
+    - per_naam: naam (lowercase) → {"naam", "systeem_ids", "trie", "aantal_paden"}
+    - groepen:  naam (lowercase) → namen die via planning (naam/aliases) bij
+                hetzelfde planningssysteem horen, incl. zichzelf
+    """
+    ids_per_naam = {}
+    originele_naam = {}
+
+    for node_id in bereikbaar["systemen"]:
+        naam = extract_system_name(boom["nodes"][node_id])
+        sleutel = _systeem_naam_sleutel(naam)
+        ids_per_naam.setdefault(sleutel, set()).add(node_id)
+        originele_naam.setdefault(sleutel, naam)
+
+    per_naam = {}
+    for sleutel, doel_ids in ids_per_naam.items():
+        trie = _bouw_trie(boom, bereikbaar, start_id, doel_ids)
+        per_naam[sleutel] = {
+            "naam": originele_naam[sleutel],
+            "systeem_ids": tuple(sorted(doel_ids)),
+            "trie": trie,
+            "aantal_paden": tel_paden(trie),
+        }
+
+    # planningssysteem (na planning_ref) → alle boomnamen die erbij horen
+    per_planning = {}
+    for sleutel in per_naam:
+        systeem = planning["systemen"].get(sleutel)
+        if systeem is not None:
+            per_planning.setdefault(systeem["naam"], []).append(sleutel)
+
+    groepen = {}
+    for sleutel in per_naam:
+        systeem = planning["systemen"].get(sleutel)
+        groepen[sleutel] = tuple(per_planning[systeem["naam"]]) if systeem else (sleutel,)
+
+    # ook planningsnamen/aliases die zelf niet als systeem-node voorkomen
+    for sleutel, systeem in planning["systemen"].items():
+        if sleutel not in groepen and systeem["naam"] in per_planning:
+            groepen[sleutel] = tuple(per_planning[systeem["naam"]])
+
+    return {"per_naam": per_naam, "groepen": groepen}
+
+
+def zoek_systeem_paden(index, naam):
+    """Naam of planning-alias → lijst van per_naam-items (leeg als onbekend)."""
+    sleutel = _systeem_naam_sleutel(naam)
+    sleutels = index["groepen"].get(sleutel, ())
+
+    # de gevraagde naam zelf eerst, daarna de aliases
+    return [index["per_naam"][s] for s in sorted(sleutels, key=lambda s: s != sleutel)]
+
+
+def trie_als_boom(boom, trie):
+    """Trie → geneste dicts in dezelfde vorm als de boomresponses (id/type/text/next)."""
+    node = boom["nodes"][trie[0]]
+    return {
+        "id": trie[0],
+        "type": node.get("type"),
+        "text": node.get("text", ""),
+        "next": [trie_als_boom(boom, kind) for kind in trie[1]],
+    }
+
+
+def trie_als_paden(boom, trie):
+    """Trie → platte lijst paden; elk pad is een lijst {id, type, text}."""
+    paden = []
+    stapel = [(trie, [])]
+
+    while stapel:
+        (node_id, kinderen), voorloper = stapel.pop()
+        node = boom["nodes"][node_id]
+        pad = voorloper + [{"id": node_id, "type": node.get("type"), "text": node.get("text", "")}]
+
+        if not kinderen:
+            paden.append(pad)
+            continue
+
+        for kind in reversed(kinderen):
+            stapel.append((kind, pad))
+
+    return paden
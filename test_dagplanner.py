@@ -0,0 +1,142 @@
+import pytest
+
+from dagplanner import plan_dagen
+
+MAX_WERK = 8
+
+
+def taak(naam, uren, **regels):
+    t = {
+        "naam": naam,
+        "uren": uren,
+        "min_man": 1,
+        "dag": 1,
+        "onderbreekbaar": True,
+        "volgende_dag_verplicht": False,
+        "samen_met": [],
+        "niet_samen_met": [],
+    }
+    t.update(regels)
+    return t
+
+
+def namen_per_dag(dagen):
+    return [[t["naam"] for t, _ in dag["delen"]] for dag in dagen]
+
+
+def uren_per_taak(dagen):
+    totaal = {}
+    for dag in dagen:
+        for t, uren in dag["delen"]:
+            totaal[t["naam"]] = totaal.get(t["naam"], 0) + uren
+    return totaal
+
+
+def controleer_capaciteit(dagen):
+    for dag in dagen:
+        assert dag["uren"] <= dag["man"] * MAX_WERK + 1e-9
+        assert dag["man"] >= max(t["min_man"] for t, _ in dag["delen"])
+
+
+# =========================
+# MAG_NIET_SAMEN_MET
+# =========================
+def test_niet_samen_nooit_op_dezelfde_dag():
+    taken = [
+        taak("schuren", 2, niet_samen_met=["coaten"]),
+        taak("coaten", 2),
+        taak("opruimen", 1),
+    ]
+
+    for doel in ("dagen", "mandagen"):
+        dagen = plan_dagen(taken, MAX_WERK, doel=doel)
+
+        for namen in namen_per_dag(dagen):
+            assert not ("schuren" in namen and "coaten" in namen)
+
+        controleer_capaciteit(dagen)
+
+
+def test_niet_samen_werkt_in_beide_richtingen():
+    taken = [taak("primer", 1), taak("stofzuigen", 1, niet_samen_met=["primer"])]
+    dagen = plan_dagen(taken, MAX_WERK)
+
+    assert namen_per_dag(dagen) == [["primer"], ["stofzuigen"]]
+
+
+# =========================
+# CAPACITEIT
+# =========================
+def test_capaciteit_per_dag():
+    taken = [taak("voorbereiden", 20), taak("coaten", 13), taak("afwerken", 5)]
+
+    for doel in ("dagen", "mandagen"):
+        dagen = plan_dagen(taken, MAX_WERK, doel=doel)
+
+        controleer_capaciteit(dagen)
+        assert uren_per_taak(dagen) == pytest.approx({"voorbereiden": 20, "coaten": 13, "afwerken": 5})
+
+
+def test_min_man_per_dag():
+    dagen = plan_dagen([taak("gieten", 6, min_man=3), taak("opruimen", 2)], MAX_WERK)
+
+    controleer_capaciteit(dagen)
+    for dag in dagen:
+        if any(t["naam"] == "gieten" for t, _ in dag["delen"]):
+            assert dag["man"] >= 3
+
+
+def test_max_man_wordt_niet_overschreden():
+    dagen = plan_dagen([taak("schuren", 40)], MAX_WERK, max_man=2)
+
+    assert all(dag["man"] <= 2 for dag in dagen)
+    assert len(dagen) == 3
+    controleer_capaciteit(dagen)
+
+
+# =========================
+# ONDERBREEKBAAR
+# =========================
+def test_niet_onderbreekbaar_in_één_dag():
+    taken = [
+        taak("schuren", 5),
+        taak("coaten", 6, onderbreekbaar=False),
+        taak("afwerken", 3),
+    ]
+
+    for doel in ("dagen", "mandagen"):
+        dagen = plan_dagen(taken, MAX_WERK, doel=doel)
+
+        met_coaten = [dag for dag in dagen if any(t["naam"] == "coaten" for t, _ in dag["delen"])]
+        assert len(met_coaten) == 1
+        assert uren_per_taak(met_coaten)["coaten"] == pytest.approx(6)
+
+        controleer_capaciteit(dagen)
+
+
+def test_niet_onderbreekbaar_groter_dan_een_dag_vergroot_ploeg():
+    dagen = plan_dagen([taak("gieten", 20, onderbreekbaar=False)], MAX_WERK)
+
+    assert len(dagen) == 1
+    assert dagen[0]["man"] == 3
+    controleer_capaciteit(dagen)
+
+
+def test_niet_onderbreekbaar_past_niet_met_max_man():
+    with pytest.raises(ValueError):
+        plan_dagen([taak("gieten", 20, onderbreekbaar=False)], MAX_WERK, max_man=2)
+
+
+# =========================
+# VOLGORDE / DROOGTIJD
+# =========================
+def test_volgende_dag_verplicht():
+    taken = [taak("primer", 2, volgende_dag_verplicht=True), taak("coaten", 2)]
+    dagen = plan_dagen(taken, MAX_WERK)
+
+    assert namen_per_dag(dagen) == [["primer"], ["coaten"]]
+
+
+def test_onbekend_doel():
+    with pytest.raises(ValueError):
+        plan_dagen([taak("schuren", 1)], MAX_WERK, doel="snelst")
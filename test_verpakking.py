@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from verpakking import optimaliseer_verpakkingen
+
+
+def _aantallen(resultaat):
+    return {r["kg"]: r["aantal"] for r in resultaat["verpakkingen"]}
+
+
+# =========================
+# MINSTE REST
+# =========================
+def test_minste_rest_wint_van_greedy():
+    # greedy (grootste eerst): 10 + 6 = 16 kg, rest 4. Exact: 2 × 6 = 12 kg, rest 0
+    resultaat = optimaliseer_verpakkingen(12, [10, 6])
+
+    assert _aantallen(resultaat) == {6: 2}
+    assert resultaat["totaal_kg"] == 12
+    assert resultaat["rest_kg"] == 0
+
+
+def test_bij_gelijke_rest_minste_verpakkingen():
+    # 20 kg: 2 × 10 of 1 × 10 + 2 × 5 of 4 × 5, allemaal zonder rest
+    resultaat = optimaliseer_verpakkingen(20, [10, 5])
+
+    assert _aantallen(resultaat) == {10: 2}
+    assert resultaat["aantal_verpakkingen"] == 2
+
+
+def test_voorbeeld_uit_docstring():
+    resultaat = optimaliseer_verpakkingen(47, [25, 10], max_klein=1)
+
+    assert _aantallen(resultaat) == {25: 2}
+    assert resultaat["totaal_kg"] == 50
+    assert resultaat["rest_kg"] == 3
+
+
+def test_halve_kilo():
+    resultaat = optimaliseer_verpakkingen(7.5, [5, 2.5])
+
+    assert _aantallen(resultaat) == {5: 1, 2.5: 1}
+    assert resultaat["rest_kg"] == 0
+
+
+# =========================
+# MAX_KLEIN
+# =========================
+def test_max_klein_begrenst_kleine_verpakkingen():
+    # zonder grens 2 × 6 (rest 0); met één kleine: 10 + 6 (rest 4)
+    resultaat = optimaliseer_verpakkingen(12, [10, 6], max_klein=1)
+
+    assert _aantallen(resultaat) == {10: 1, 6: 1}
+    assert resultaat["rest_kg"] == 4
+
+
+def test_max_klein_nul_alleen_grootste():
+    resultaat = optimaliseer_verpakkingen(12, [10, 6], max_klein=0)
+
+    assert _aantallen(resultaat) == {10: 2}
+    assert resultaat["rest_kg"] == 8
+
+
+def test_max_klein_nooit_overschreden():
+    for kg in range(1, 120):
+        resultaat = optimaliseer_verpakkingen(kg, [25, 10, 4], max_klein=2)
+        kleine = sum(aantal for maat, aantal in _aantallen(resultaat).items() if maat != 25)
+
+        assert kleine <= 2
+        assert resultaat["totaal_kg"] >= kg
+
+
+# =========================
+# THREADS
+# =========================
+def test_gedeelde_tabel_vanuit_threads():
+    # onbegrensd + meerdere kleine maten: de tabel groeit terwijl andere threads lezen
+    verpakkingen = [25, 7, 3]
+    hoeveelheden = list(range(1, 2000, 3))
+
+    with ThreadPoolExecutor(8) as pool:
+        parallel = list(pool.map(lambda kg: optimaliseer_verpakkingen(kg, verpakkingen), hoeveelheden))
+
+    for kg, resultaat in zip(hoeveelheden, parallel):
+        assert resultaat == optimaliseer_verpakkingen(kg, verpakkingen)
+
+
+# =========================
+# RANDGEVALLEN
+# =========================
+def test_geen_verpakkingen_of_geen_materiaal():
+    assert optimaliseer_verpakkingen(10, []) is None
+    assert optimaliseer_verpakkingen(0, [10]) is None
@@ -0,0 +1,166 @@
+import math
+import threading
+from functools import reduce
+
+# =========================
+# VERPAKKINGEN OPTIMALISEREN
+# =========================
+# Kiest per product de combinatie verpakkingen met het minste restmateriaal
+# (daarna: zo min mogelijk verpakkingen), met hoogstens `max_klein` stuks van
+# de kleinere verpakkingen. Exact: dynamisch programmeren over de kleine
+# verpakkingen, aangevuld met de grootste verpakking.
+#
+# De tabellen worden per (verpakkingen, max_klein) gecachet; ze hangen alleen
+# van de productdata af en blijven dus geldig na een reload.
+#
+# Threads (gunicorn threads / ASGI-threadpool) delen de cache: uitbreiden
+# gebeurt onder een lock op een kopie, die daarna in één keer de oude
+# "bereikbaar" vervangt. Een gepubliceerde dict wordt nooit meer aangepast,
+# dus lezen kan zonder lock.
+
+# kg → interne eenheid van 0,1 kg
+SCHAAL = 10
+
+_TABELLEN = {}
+_LOCK = threading.Lock()
+
+
+def _naar_eenheden(kg):
+    return int(round(kg * SCHAAL))
+
+
+def _plus_een(aantallen, i):
+    return aantallen[:i] + (aantallen[i] + 1,) + aantallen[i + 1:]
+
+
+def _nieuwe_tabel(verpakkingen, max_klein):
+    maten = sorted({_naar_eenheden(v) for v in verpakkingen if v and v > 0}, reverse=True)
+    if not maten:
+        raise ValueError("geen geldige verpakkingen")
+
+    stap = reduce(math.gcd, maten)
+    klein = [m // stap for m in maten[1:]]
+
+    tabel = {
+        "stap": stap,
+        "groot": maten[0] // stap,
+        "klein": klein,
+        # hoeveelheid met alleen kleine verpakkingen → (aantal, aantallen per maat)
+        "bereikbaar": {0: (0, (0,) * len(klein))},
+        "tot": 0,
+    }
+
+    if max_klein is not None:
+        # begrensd: alle combinaties met hoogstens max_klein kleine verpakkingen
+        laag = dict(tabel["bereikbaar"])
+
+        for _ in range(max_klein):
+            volgende = {}
+            for hoeveel, (aantal, aantallen) in laag.items():
+                for i, maat in enumerate(klein):
+                    kandidaat = (aantal + 1, _plus_een(aantallen, i))
+                    huidig = tabel["bereikbaar"].get(hoeveel + maat)
+                    if huidig is None or kandidaat < huidig:
+                        tabel["bereikbaar"][hoeveel + maat] = kandidaat
+                        volgende[hoeveel + maat] = kandidaat
+            laag = volgende
+
+        tabel["tot"] = math.inf
+
+    return tabel
+
+
+def _vul_tot(tabel, grens):
+    """Onbegrensd aantal kleine verpakkingen: tabel uitbreiden tot `grens`."""
+    if grens <= tabel["tot"] or not tabel["klein"]:
+        return
+
+    with _LOCK:
+        # intussen door een andere thread uitgebreid?
+        if grens <= tabel["tot"]:
+            return
+        _breid_uit(tabel, grens)
+
+
+def _breid_uit(tabel, grens):
+    bereikbaar = dict(tabel["bereikbaar"])
+
+    for hoeveel in range(tabel["tot"] + 1, grens + 1):
+        beste = None
+        for i, maat in enumerate(tabel["klein"]):
+            vorige = bereikbaar.get(hoeveel - maat)
+            if vorige is None:
+                continue
+            kandidaat = (vorige[0] + 1, _plus_een(vorige[1], i))
+            if beste is None or kandidaat < beste:
+                beste = kandidaat
+        if beste is not None:
+            bereikbaar[hoeveel] = beste
+
+    # 🔑 eerst de nieuwe dict, dan de grens: wie "tot" ziet, ziet ook de waarden
+    tabel["bereikbaar"] = bereikbaar
+    tabel["tot"] = grens
+
+
+def _los_op(tabel, nodig):
+    """Beste combinatie voor `nodig` eenheden: (sleutel, aantal groot, aantallen klein)."""
+    groot = tabel["groot"]
+    _vul_tot(tabel, nodig + groot)
+
+    beste = None
+    for klein_hoeveel, (klein_aantal, aantallen) in tabel["bereikbaar"].items():
+        groot_aantal = max(0, -(-(nodig - klein_hoeveel) // groot))
+        totaal = klein_hoeveel + groot_aantal * groot
+
+        # minste rest, dan minste verpakkingen, dan minste kleine verpakkingen
+        sleutel = (totaal - nodig, groot_aantal + klein_aantal, klein_aantal)
+
+        if beste is None or sleutel < beste[0]:
+            beste = (sleutel, groot_aantal, aantallen)
+
+    return beste
+
+
+def _tabel(verpakkingen, max_klein):
+    sleutel = (tuple(verpakkingen), max_klein)
+    tabel = _TABELLEN.get(sleutel)
+    if tabel is None:
+        with _LOCK:
+            tabel = _TABELLEN.get(sleutel)
+            if tabel is None:
+                tabel = _TABELLEN[sleutel] = _nieuwe_tabel(verpakkingen, max_klein)
+    return tabel
+
+
+def optimaliseer_verpakkingen(kg, verpakkingen, max_klein=None):
+    """
+    Verpakkingen voor `kg` materiaal, bv. 47 kg met [25, 10] en max_klein 1:
+    {"verpakkingen": [{"kg": 25, "aantal": 2}], "totaal_kg": 50, "rest_kg": 3, ...}
+    Geeft None terug als er geen verpakkingen bekend zijn.
+    """
+    if not verpakkingen or kg <= 0:
+        return None
+
+    tabel = _tabel(verpakkingen, max_klein)
+    nodig = -(-math.ceil(kg * SCHAAL - 1e-9) // tabel["stap"])
+
+    _, groot_aantal, aantallen = _los_op(tabel, nodig)
+
+    maten = sorted({v for v in verpakkingen if v and v > 0}, reverse=True)
+    regels = []
+
+    if groot_aantal:
+        regels.append({"kg": maten[0], "aantal": groot_aantal})
+
+    for maat, aantal in zip(maten[1:], aantallen):
+        if aantal:
+            regels.append({"kg": maat, "aantal": aantal})
+
+    totaal_kg = sum(r["kg"] * r["aantal"] for r in regels)
+
+    return {
+        "verpakkingen": regels,
+        "aantal_verpakkingen": sum(r["aantal"] for r in regels),
+        "totaal_kg": round(totaal_kg, 2),
+        "rest_kg": round(totaal_kg - kg, 2),
+    }
@@ -0,0 +1,130 @@
+import math
+import re
+from bisect import bisect_left
+
+from boom_index import normaliseer
+from bereikbaarheid import bits_naar_posities
+
+# =========================
+# ZOEKINDEX (NODE-TEKSTEN)
+# =========================
+# Omgekeerde index over de tekst van alle nodes, gebouwd met de snapshot:
+# token → bitset (Python int) over de node-volgorde. Tekst wordt genormaliseerd
+# zoals normaliseer() doet (prefix "Vrg:"/"Antw:"/... weg, geen accenten,
+# kleine letters). Elke zoekterm matcht als prefix: via een gesorteerde
+# tokenlijst is dat een binary search plus een OR over de gevonden tokens.
+#
+# Ranking: per zoekterm telt een hele-woord-treffer zwaarder dan een prefix,
+# gewogen met idf (zeldzame woorden tellen meer); kortere teksten winnen bij
+# gelijke score.
+
+NODE_TYPES = ("vraag", "antwoord", "systeem", "afw", "xtr")
+
+GEWICHT_HEEL = 1.0
+GEWICHT_PREFIX = 0.5
+
+
+def tokens(txt):
+    return re.findall(r"[0-9a-z]+", normaliseer(txt))
+
+
+def compileer_zoekindex(boom):
+    """
+    - ids:       positie → node-id
+    - tokens:    positie → frozenset van tokens in de tekst
+    - lengtes:   positie → aantal tokens
+    - woorden:   gesorteerde tuple van alle tokens (voor prefix-zoeken)
+    - postings:  token → bitset van posities
+    - idf:       token → log(N / df)
+    - per_type:  node-type → bitset van posities
+    """
+    ids = []
+    node_tokens = []
+    lengtes = []
+    postings = {}
+    per_type = {}
+
+    for positie, (node_id, node) in enumerate(boom["nodes"].items()):
+        woorden = tokens(node.get("text", ""))
+        bit = 1 << positie
+
+        ids.append(node_id)
+        node_tokens.append(frozenset(woorden))
+        lengtes.append(len(woorden))
+
+        for woord in set(woorden):
+            postings[woord] = postings.get(woord, 0) | bit
+
+        node_type = node.get("type")
+        per_type[node_type] = per_type.get(node_type, 0) | bit
+
+    aantal = len(ids)
+
+    return {
+        "ids": tuple(ids),
+        "tokens": tuple(node_tokens),
+        "lengtes": tuple(lengtes),
+        "woorden": tuple(sorted(postings)),
+        "postings": postings,
+        "idf": {woord: math.log(1 + aantal / bits.bit_count()) for woord, bits in postings.items()},
+        "per_type": per_type,
+    }
+
+
+def _prefix_woorden(index, term):
+    woorden = index["woorden"]
+    begin = bisect_left(woorden, term)
+    eind = begin
+
+    while eind < len(woorden) and woorden[eind].startswith(term):
+        eind += 1
+
+    return woorden[begin:eind]
+
+
+def zoek(index, query, types=None, limiet=20):
+    """
+    Nodes waarvan de tekst élke zoekterm bevat (als woord of woordbegin).
+    Geeft (totaal, [(positie, score), ...]) terug, best scorende eerst.
+    """
+    termen = list(dict.fromkeys(tokens(query)))
+    if not termen:
+        return 0, []
+
+    kandidaten = -1  # alle bits aan
+    if types:
+        kandidaten = 0
+        for node_type in types:
+            kandidaten |= index["per_type"].get(node_type, 0)
+
+    per_term = []
+    for term in termen:
+        woorden = _prefix_woorden(index, term)
+        bits = 0
+        for woord in woorden:
+            bits |= index["postings"][woord]
+
+        kandidaten &= bits
+        if not kandidaten:
+            return 0, []
+
+        per_term.append(term)
+
+    posities = bits_naar_posities(kandidaten)
+    idf = index["idf"]
+    resultaten = []
+
+    for positie in posities:
+        node_tokens = index["tokens"][positie]
+        score = 0.0
+
+        for term in per_term:
+            if term in node_tokens:
+                score += GEWICHT_HEEL * idf[term]
+            else:
+                score += GEWICHT_PREFIX * max(idf[w] for w in node_tokens if w.startswith(term))
+
+        resultaten.append((positie, score / (1 + 0.05 * index["lengtes"][positie])))
+
+    resultaten.sort(key=lambda r: (-r[1], r[0]))
+    return len(resultaten), resultaten[:limiet]